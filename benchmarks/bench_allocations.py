@@ -0,0 +1,59 @@
+import argparse
+import sys
+import os
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.setrecursionlimit(10000)
+
+import main
+from lib.basic.value import Value
+
+SCRIPTS = {
+  "while": ([], "[VAR i = 0, WHILE i < 10000 : VAR i = i + 1]"),
+  "nested_for": ([], "FOR i = 0 TO 100 : FOR j = 0 TO 100 : i * j + 1"),
+  "fib": (["FUNC fib(n) -> IF n < 2 THEN n ELSE fib(n - 1) + fib(n - 2)"], "fib(15)"),
+  "list_access": (["VAR L = FOR i = 0 TO 100 : i"], "FOR i = 0 TO 100 : FOR j = 0 TO 100 : (L / j) + L / i")
+}
+
+class AllocationCounter:
+  def __init__(self):
+    self.count = 0
+    self.original_init = Value.__init__
+
+  def __enter__(self):
+    original_init = self.original_init
+
+    def counting_init(value):
+      self.count += 1
+      original_init(value)
+
+    Value.__init__ = counting_init
+    return self
+
+  def __exit__(self, *_):
+    Value.__init__ = self.original_init
+
+def measure(mode:str, setup:list, script:str) -> tuple:
+  for line in setup:
+    main.run("<bench>", line, mode=mode)
+
+  tracemalloc.start()
+  with AllocationCounter() as counter:
+    _, error = main.run("<bench>", script, mode=mode)
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  if error: raise Exception(error.as_string())
+  return counter.count, peak
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(description="Counts Value objects allocated while running each benchmark script")
+  arg_parser.add_argument("--mode", choices=list(main.EXECUTION_MODES.keys()), action="append")
+  args = arg_parser.parse_args()
+
+  print(f"{'script':<14}{'mode':<14}{'values allocated':>18}{'peak memory (KiB)':>20}")
+  for name, (setup, script) in SCRIPTS.items():
+    for mode in args.mode or list(main.EXECUTION_MODES.keys()):
+      count, peak = measure(mode, setup, script)
+      print(f"{name:<14}{mode:<14}{count:>18}{peak / 1024:>20.1f}")
@@ -0,0 +1,97 @@
+import argparse
+import gc
+import sys
+import os
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from lib.hooks import Hooks
+from lib.interpreter import Interpreter
+from lib.basic.symbol_table import OverlaySymbolTable
+from benchmarks.bench_suite import SCRIPTS, BUILTINS
+
+# Every hook check reads the hooks attribute of the interpreter, so runs differ only in what it is set to
+def no_op(*args):
+  pass
+
+def listening_hooks() -> Hooks:
+  hooks = Hooks()
+  for event in Hooks.EVENTS:
+    hooks.register(event, no_op)
+  return hooks
+
+HOOKS = {
+  "none": lambda: None,
+  "empty": Hooks,
+  "no-op callbacks": listening_hooks
+}
+
+# Counts the places a run checks for hooks, one per activation of a function and one per loop
+class CountingHooks(Hooks):
+  def __init__(self):
+    super(CountingHooks, self).__init__()
+    self.checks = 0
+
+  def traced_call(self, function, exec_ctx, run):
+    self.checks += 1
+    return super(CountingHooks, self).traced_call(function, exec_ctx, run)
+
+  def loop_visitor(self, visit, loop_node):
+    self.checks += 1
+    return super(CountingHooks, self).loop_visitor(visit, loop_node)
+
+def run_once(node, hooks) -> float:
+  interpreter = Interpreter()
+  interpreter.hooks = hooks
+  gc.collect()
+  start = time.perf_counter()
+  _, error = main.execute(node, interpreter, OverlaySymbolTable(BUILTINS))
+  elapsed = time.perf_counter() - start
+  if error: raise Exception(error.as_string())
+  return elapsed
+
+# Seconds of one check without hooks, reading the attribute and comparing it with None
+def check_seconds(number:int=1000000) -> float:
+  interpreter = Interpreter()
+  checked = timeit.timeit("if interpreter.hooks is None: pass", globals={"interpreter": interpreter}, number=number)
+  empty = timeit.timeit("pass", number=number)
+  return max(0.0, checked - empty) / number
+
+# The hook settings take turns within every repeat, starting at a different one each time, so drift of
+# the machine and warm up favour none of them
+def measure(script:str, repeat:int) -> dict:
+  node, error = main.compile_program("<bench>", script, cache=False)
+  if error: raise Exception(error.as_string())
+
+  names = list(HOOKS.keys())
+  best = {}
+  for index in range(repeat):
+    for name in names[index % len(names):] + names[:index % len(names)]:
+      elapsed = run_once(node, HOOKS[name]())
+      best[name] = elapsed if name not in best else min(best[name], elapsed)
+
+  counting = CountingHooks()
+  run_once(node, counting)
+  best["checks"] = counting.checks
+  return best
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(description="Compares interpreter runs without hooks, with empty hooks and with no-op callbacks, and estimates what the hook checks cost a run without hooks")
+  arg_parser.add_argument("--script", choices=list(SCRIPTS.keys()), action="append")
+  arg_parser.add_argument("--repeat", type=int, default=8)
+  args = arg_parser.parse_args()
+
+  seconds_per_check = check_seconds()
+  print(f"one check without hooks: {seconds_per_check * 1e9:.1f} ns")
+  print(f"{'script':<18}{'hooks':<18}{'seconds':>10}{'overhead':>10}")
+  for name in args.script or list(SCRIPTS.keys()):
+    best = measure(SCRIPTS[name], args.repeat)
+    baseline = best["none"]
+    for hooks_name in HOOKS:
+      print(f"{name:<18}{hooks_name:<18}{best[hooks_name]:>10.3f}{(best[hooks_name] / baseline - 1) * 100:>9.1f}%")
+    # Checks times their cost, the part of a run without hooks spent on hooks, free of timing noise
+    checks_cost = best["checks"] * seconds_per_check
+    print(f"{name:<18}{'checks':<18}{checks_cost:>10.5f}{checks_cost / baseline * 100:>9.3f}%  ({best['checks']} checks)")
@@ -0,0 +1,45 @@
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+def generate_source(size:int) -> str:
+  elements = []
+  length = 0
+  index = 0
+  while length < size:
+    element = f'VAR value_{index} = IF value_{index} >= {index}.5 THEN "text {index}" ELSE [{index}, -{index} ^ 2]'
+    elements.append(element)
+    length += len(element) + 2
+    index += 1
+  return "[" + ", ".join(elements) + "]"
+
+def measure(lexer:str, text:str, repeat:int) -> tuple:
+  best = None
+  token_count = 0
+  for _ in range(repeat):
+    start = time.perf_counter()
+    tokens, error = main.LEXERS[lexer]("<bench>", text).make_tokens()
+    elapsed = time.perf_counter() - start
+    if error: raise Exception(error.as_string())
+    token_count = len(tokens)
+    best = elapsed if best is None else min(best, elapsed)
+  return token_count, best
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(description="Measures lexer throughput on generated multi-megabyte sources")
+  arg_parser.add_argument("--lexer", choices=list(main.LEXERS.keys()), action="append")
+  arg_parser.add_argument("--size", type=float, action="append", help="Source size in MB")
+  arg_parser.add_argument("--repeat", type=int, default=3)
+  args = arg_parser.parse_args()
+
+  print(f"{'size (MB)':<12}{'lexer':<10}{'tokens':>10}{'seconds':>10}{'MB/s':>10}")
+  for size in args.size or [1, 4]:
+    text = generate_source(int(size * 1024 * 1024))
+    for lexer in args.lexer or list(main.LEXERS.keys()):
+      token_count, elapsed = measure(lexer, text, args.repeat)
+      print(f"{len(text) / 1024 / 1024:<12.1f}{lexer:<10}{token_count:>10}{elapsed:>10.2f}{len(text) / 1024 / 1024 / elapsed:>10.2f}")
@@ -0,0 +1,45 @@
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+SCRIPTS = {
+  "add_element": "[VAR L = [], VOID FOR i = 0 TO {size} : VAR L = L + i, L / -1]",
+  "add_list": "[VAR L = [], VOID FOR i = 0 TO {size} : VAR L = L + [i, i], L / -1]",
+  "remove_last": "[VAR L = FOR i = 0 TO {size} : i, VOID FOR i = 0 TO {size} : VAR L = L - -1, L]",
+  "append_builtin": "[VAR L = [], VOID FOR i = 0 TO {size} : APPEND(L, i), L / -1]",
+  "index": "[VAR L = FOR i = 0 TO {size} : i, VOID FOR i = 0 TO {size} : L / i]",
+  "transform_loop": "[VAR L = FOR i = 0 TO {size} : i, VAR L = FOR i = 0 TO {size} : (L / i) * 1.5 + 1, L / -1]",
+  "transform_vecop": "[VAR L = FOR i = 0 TO {size} : i, VAR L = VECOP(VECOP(L, \"*\", 1.5), \"+\", 1), L / -1]",
+  "map_loop": "[VAR L = RANGE(0, {size}), FUNC f(x) -> x * 2 + 1, VAR L = FOR i = 0 TO {size} : f(L / i), L / -1]",
+  "map_builtin": "[VAR L = RANGE(0, {size}), FUNC f(x) -> x * 2 + 1, VAR L = MAP(L, f), L / -1]",
+  "reduce_builtin": "[VAR L = RANGE(0, {size}), REDUCE(L, FUNC (a, b) -> a + b, 0)]",
+  "sum_builtin": "[VAR L = RANGE(0, {size}), SUM(L)]"
+}
+
+def measure(mode:str, script:str, repeat:int) -> float:
+  best = None
+  for _ in range(repeat):
+    start = time.perf_counter()
+    _, error = main.run("<bench>", script, mode=mode)
+    elapsed = time.perf_counter() - start
+    if error: raise Exception(error.as_string())
+    best = elapsed if best is None else min(best, elapsed)
+  return best
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(description="Times scripts building and taking apart lists element by element")
+  arg_parser.add_argument("--mode", choices=list(main.EXECUTION_MODES.keys()), action="append")
+  arg_parser.add_argument("--size", type=int, action="append")
+  arg_parser.add_argument("--repeat", type=int, default=3)
+  args = arg_parser.parse_args()
+
+  print(f"{'script':<18}{'size':>8}  {'mode':<14}{'seconds':>10}")
+  for name, script in SCRIPTS.items():
+    for size in args.size or [1000, 10000]:
+      for mode in args.mode or list(main.EXECUTION_MODES.keys()):
+        print(f"{name:<18}{size:>8}  {mode:<14}{measure(mode, script.format(size=size), args.repeat):>10.3f}")
@@ -0,0 +1,38 @@
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+SCRIPTS = {
+  "nested_for": "FOR i = 0 TO 300 : FOR j = 0 TO 300 : i + j",
+  "nested_for_void": "VOID FOR i = 0 TO 300 : FOR j = 0 TO 300 : i + j",
+  "nested_for_step": "FOR i = 300 TO 0 STEP -1 : FOR j = 0 TO 600 STEP 2 : i - j",
+  "nested_for_float": "FOR i = 0 TO 300.5 : FOR j = 0.5 TO 300 : i * j",
+  "triple_for": "FOR i = 0 TO 40 : FOR j = 0 TO 40 : FOR k = 0 TO 40 : i + j + k",
+  "nested_for_in_function": "[FUNC grid(n) -> FOR i = 0 TO n : FOR j = 0 TO n : i * j, grid(300)]"
+}
+
+def measure(mode:str, script:str, repeat:int) -> float:
+  best = None
+  for _ in range(repeat):
+    start = time.perf_counter()
+    _, error = main.run("<bench>", script, mode=mode)
+    elapsed = time.perf_counter() - start
+    if error: raise Exception(error.as_string())
+    best = elapsed if best is None else min(best, elapsed)
+  return best
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(description="Times nested FOR loop scripts")
+  arg_parser.add_argument("--mode", choices=list(main.EXECUTION_MODES.keys()), action="append")
+  arg_parser.add_argument("--repeat", type=int, default=3)
+  args = arg_parser.parse_args()
+
+  print(f"{'script':<26}{'mode':<14}{'seconds':>10}")
+  for name, script in SCRIPTS.items():
+    for mode in args.mode or list(main.EXECUTION_MODES.keys()):
+      print(f"{name:<26}{mode:<14}{measure(mode, script, args.repeat):>10.3f}")
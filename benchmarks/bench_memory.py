@@ -0,0 +1,94 @@
+import argparse
+import sys
+import os
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.setrecursionlimit(10000)
+
+import main
+from lib.lexer import Lexer
+from lib.prsr import Parser
+from lib.tokenClass import Token, TT_INT, TT_PLUS
+from lib.basic.position import Position, Source
+from lib.basic.context import Context
+from lib.basic.runtime_result import RTResult
+from lib.nodes import NumberNode, BinOpNode
+from lib.number_val import Number
+from lib.string_val import String
+from lib.list_val import List
+
+SOURCE = Source("<bench>", "1")
+POSITION = Position(0, SOURCE)
+TOKEN = Token(TT_INT, 1, POSITION)
+NODE = NumberNode(TOKEN)
+
+OBJECTS = {
+  "Position": lambda: Position(0, SOURCE),
+  "Token": lambda: Token(TT_INT, 1, POSITION, POSITION),
+  "NumberNode": lambda: NumberNode(TOKEN),
+  "BinOpNode": lambda: BinOpNode(NODE, Token(TT_PLUS), NODE),
+  "Number": lambda: Number(100000),
+  "String": lambda: String("a"),
+  "List": lambda: List([]),
+  "Context": lambda: Context("<bench>"),
+  "RTResult": lambda: RTResult()
+}
+
+def memory_per_object(factory, count:int) -> float:
+  holder = [None] * count
+  tracemalloc.start()
+  start, _ = tracemalloc.get_traced_memory()
+  for index in range(count):
+    holder[index] = factory()
+  end, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  return (end - start) / count
+
+def parsed_ast_memory(terms:int) -> tuple:
+  text = " + ".join(str(term) for term in range(terms))
+  tracemalloc.start()
+  tokens, error = Lexer("<bench>", text).make_tokens()
+  if error: raise Exception(error.as_string())
+  ast = Parser(tokens).parse()
+  if ast.error: raise Exception(ast.error.as_string())
+  current, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  return len(tokens), current
+
+def list_value_memory(length:int) -> int:
+  tracemalloc.start()
+  value, error = main.run("<bench>", f"FOR i = 0 TO {length} : i * 1.5")
+  current, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  if error: raise Exception(error.as_string())
+  return current
+
+def attribute_access_ns(number:int) -> dict:
+  node = BinOpNode(NODE, Token(TT_PLUS), NODE)
+  value = Number(100000)
+  return {
+    "BinOpNode.left_node": timeit.timeit("node.left_node", globals={"node": node}, number=number) / number * 1e9,
+    "Number.value": timeit.timeit("value.value", globals={"value": value}, number=number) / number * 1e9
+  }
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(description="Reports memory per object and attribute access cost of the object model")
+  arg_parser.add_argument("--count", type=int, default=100000)
+  arg_parser.add_argument("--terms", type=int, default=2000)
+  args = arg_parser.parse_args()
+
+  print(f"{'object':<24}{'bytes per object':>18}")
+  for name, factory in OBJECTS.items():
+    print(f"{name:<24}{memory_per_object(factory, args.count):>18.1f}")
+
+  print()
+  token_count, ast_bytes = parsed_ast_memory(args.terms)
+  print(f"{'parsed AST':<24}{ast_bytes / 1024:>14.1f} KiB ({token_count} tokens)")
+  print(f"{'List value':<24}{list_value_memory(args.count) / 1024:>14.1f} KiB ({args.count} elements)")
+
+  print()
+  print(f"{'attribute':<24}{'ns per access':>18}")
+  for name, elapsed in attribute_access_ns(args.count * 10).items():
+    print(f"{name:<24}{elapsed:>18.1f}")
@@ -0,0 +1,130 @@
+import argparse
+import gc
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from lib.prsr import Parser
+
+# Programs growing in length, size is the source length in bytes
+def binop_chain(size:int) -> str:
+  terms = []
+  length = 0
+  index = 0
+  while length < size:
+    term = f"{index} {'+-*'[index % 3]} "
+    terms.append(term)
+    length += len(term)
+    index += 1
+  return "".join(terms) + "1"
+
+def list_literal(size:int) -> str:
+  elements = []
+  length = 0
+  index = 0
+  while length < size:
+    element = f'"item {index}"' if index % 2 else str(index)
+    elements.append(element)
+    length += len(element) + 2
+    index += 1
+  return "[" + ", ".join(elements) + "]"
+
+# Programs growing in nesting, size is the depth
+def nested_parens(depth:int) -> str:
+  return "(" * depth + "1" + ")" * depth
+
+def nested_if(depth:int) -> str:
+  return "IF 1 THEN " * depth + "1" + " ELSE 0" * depth
+
+def nested_func(depth:int) -> str:
+  return "FUNC (a) -> " * depth + "a"
+
+def nested_list(depth:int) -> str:
+  return "[" * depth + "1" + "]" * depth
+
+GENERATORS = {
+  "binop_chain": binop_chain,
+  "list_literal": list_literal
+}
+
+NESTED_GENERATORS = {
+  "nested_parens": nested_parens,
+  "nested_if": nested_if,
+  "nested_func": nested_func,
+  "nested_list": nested_list
+}
+
+# Lexes and parses once, a parser running out of Python stack is reported instead of raised
+def lex_and_parse(lexer:str, text:str) -> dict:
+  gc.collect()
+  start = time.perf_counter()
+  tokens, error = main.LEXERS[lexer]("<bench>", text).make_tokens()
+  lexed = time.perf_counter()
+  if error: raise Exception(error.as_string())
+
+  try:
+    ast = Parser(tokens).parse()
+  except RecursionError:
+    return {"tokens": len(tokens), "lex": lexed - start, "parse": None, "error": "RecursionError"}
+  parsed = time.perf_counter()
+  if ast.error: raise Exception(ast.error.as_string())
+  return {"tokens": len(tokens), "lex": lexed - start, "parse": parsed - lexed, "error": None}
+
+def peak_memory(lexer:str, text:str) -> int:
+  tracemalloc.start()
+  try:
+    lex_and_parse(lexer, text)
+    _, peak = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+  return peak
+
+# Deepest nesting the parser still handles under the current recursion limit
+def max_depth(lexer:str, generator, limit:int=100000) -> int:
+  low, high = 0, 1
+  while high <= limit and lex_and_parse(lexer, generator(high))["error"] is None:
+    low, high = high, high * 2
+  if high > limit: return low
+
+  while high - low > 1:
+    middle = (low + high) // 2
+    if lex_and_parse(lexer, generator(middle))["error"] is None:
+      low = middle
+    else:
+      high = middle
+  return low
+
+def print_row(name:str, size:int, text:str, result:dict, memory:bool, lexer:str):
+  parse = "-" if result["parse"] is None else f"{result['parse']:.3f}"
+  peak = f"{peak_memory(lexer, text) / 1024 / 1024:.1f}" if memory and result["error"] is None else "-"
+  print(f"{name:<16}{size:>12}{len(text) / 1024 / 1024:>10.2f}{result['tokens']:>10}{result['lex']:>10.3f}{parse:>10}{peak:>12}  {result['error'] or ''}".rstrip())
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(description="Measures how lexing and parsing scale with the length and nesting depth of generated programs")
+  arg_parser.add_argument("--lexer", choices=list(main.LEXERS.keys()), default="regex")
+  arg_parser.add_argument("--size", type=float, action="append", help="Source size in MB of the long programs")
+  arg_parser.add_argument("--depth", type=int, action="append", help="Nesting depth of the nested programs")
+  arg_parser.add_argument("--recursion-limit", type=int, default=sys.getrecursionlimit())
+  arg_parser.add_argument("--no-memory", action="store_true", help="Skip the (slow) tracemalloc pass")
+  args = arg_parser.parse_args()
+  sys.setrecursionlimit(args.recursion_limit)
+
+  print(f"{'program':<16}{'size':>12}{'MB':>10}{'tokens':>10}{'lex s':>10}{'parse s':>10}{'peak MB':>12}")
+  for name, generator in GENERATORS.items():
+    for size in args.size or [0.5, 2, 8]:
+      text = generator(int(size * 1024 * 1024))
+      print_row(name, len(text), text, lex_and_parse(args.lexer, text), not args.no_memory, args.lexer)
+
+  for name, generator in NESTED_GENERATORS.items():
+    for depth in args.depth or [10, 50, 100, 1000]:
+      text = generator(depth)
+      print_row(name, depth, text, lex_and_parse(args.lexer, text), not args.no_memory, args.lexer)
+
+  print()
+  print(f"{'program':<16}{'max depth':>12}  (recursion limit {sys.getrecursionlimit()})")
+  for name, generator in NESTED_GENERATORS.items():
+    print(f"{name:<16}{max_depth(args.lexer, generator):>12}")
@@ -0,0 +1,37 @@
+import argparse
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+SCRIPTS = {
+  "report_loop": "[VAR out = \"\", VOID FOR i = 0 TO {lines} : VAR out = out + \"line \" + PRINT_RET(i) + \" | \", PRINT_RET(out)]",
+  "report_function": "[FUNC row(out, i) -> out + \"row \" + PRINT_RET(i * 2) + \" | \", VAR out = \"\", VOID FOR i = 0 TO {lines} : VAR out = row(out, i), PRINT_RET(out)]",
+  "report_reduce": "[VAR out = REDUCE(RANGE(0, {lines}), FUNC (out, i) -> out + \"item \" + PRINT_RET(i) + \" | \", \"\"), PRINT_RET(out)]"
+}
+
+def measure(mode:str, script:str, repeat:int) -> float:
+  best = None
+  for _ in range(repeat):
+    start = time.perf_counter()
+    _, error = main.run("<bench>", script, mode=mode)
+    elapsed = time.perf_counter() - start
+    if error: raise Exception(error.as_string())
+    best = elapsed if best is None else min(best, elapsed)
+  return best
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(description="Times scripts building long outputs by string concatenation")
+  arg_parser.add_argument("--mode", choices=list(main.EXECUTION_MODES.keys()), action="append")
+  arg_parser.add_argument("--lines", type=int, action="append")
+  arg_parser.add_argument("--repeat", type=int, default=3)
+  args = arg_parser.parse_args()
+
+  print(f"{'script':<18}{'lines':>8}  {'mode':<14}{'seconds':>10}")
+  for name, script in SCRIPTS.items():
+    for lines in args.lines or [10000, 100000]:
+      for mode in args.mode or list(main.EXECUTION_MODES.keys()):
+        print(f"{name:<18}{lines:>8}  {mode:<14}{measure(mode, script.format(lines=lines), args.repeat):>10.3f}")
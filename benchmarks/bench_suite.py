@@ -0,0 +1,185 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import os
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.setrecursionlimit(10000)
+
+import main
+from lib.prsr import Parser
+from lib.optimizer import Optimizer
+from lib.resolver import Resolver
+from lib.interpreter import Interpreter
+from lib.basic.context import Context
+from lib.basic.symbol_table import OverlaySymbolTable
+
+SCRIPTS = {
+  "fib": "[FUNC fib(n) -> IF n < 2 THEN n ELSE fib(n - 1) + fib(n - 2), fib(18)]",
+  "nested_for": "FOR i = 0 TO 200 : FOR j = 0 TO 200 : i * j + 1",
+  "nested_while": "[VAR i = 0, VAR total = 0, VOID WHILE i < 200 : [VAR j = 0, VOID WHILE j < 100 : [VAR total = total + j, VAR j = j + 1], VAR i = i + 1], total]",
+  "append_builtin": "[VAR L = [], VOID FOR i = 0 TO 20000 : APPEND(L, i), L / -1]",
+  "add_element": "[VAR L = [], VOID FOR i = 0 TO 20000 : VAR L = L + i, L / -1]",
+  "string_concat": "[VAR s = \"\", VOID FOR i = 0 TO 20000 : VAR s = s + \"ab\", s]",
+  "builtin_calls": "[VAR n = 0, VOID FOR i = 0 TO 20000 : IF IS_NUM(i) AND IS_LIST([i]) THEN VAR n = n + 1 ELSE 0, n]"
+}
+
+STAGES = ("lex", "parse", "compile", "run")
+# What the throughput of a stage counts, the front end handles tokens and running visits nodes
+UNITS = {"lex": "tokens", "parse": "tokens", "compile": "tokens", "run": "nodes"}
+
+# Every run gets its own global scope, so nothing one run assigned stays alive during the next
+BUILTINS = main.builtin_symbol_table()
+
+class CountingInterpreter(Interpreter):
+  def __init__(self):
+    self.visits = 0
+
+  def visit(self, node, context:Context):
+    self.visits += 1
+    return super(CountingInterpreter, self).visit(node, context)
+
+def compile_script(script:str, lexer:str) -> tuple:
+  tokens, error = main.LEXERS[lexer]("<bench>", script).make_tokens()
+  if error: raise Exception(error.as_string())
+  ast = Parser(tokens).parse()
+  if ast.error: raise Exception(ast.error.as_string())
+  node = Optimizer().optimize(ast.node)
+  Resolver().resolve(node)
+  return tokens, node
+
+# Work done by each stage, the nodes are the ones the tree walking interpreter visits whatever the
+# mode, so the run throughput of modes stays comparable
+def work(script:str, lexer:str) -> dict:
+  tokens, node = compile_script(script, lexer)
+  context = Context("<program>")
+  context.symbol_table = OverlaySymbolTable(BUILTINS)
+  interpreter = CountingInterpreter()
+  result = interpreter.visit(node, context)
+  if result.error: raise Exception(result.error.as_string())
+  return {"tokens": len(tokens), "nodes": interpreter.visits}
+
+def run_stages(script:str, lexer:str, mode:str) -> dict:
+  times = {}
+
+  start = time.perf_counter()
+  tokens, error = main.LEXERS[lexer]("<bench>", script).make_tokens()
+  times["lex"] = time.perf_counter() - start
+  if error: raise Exception(error.as_string())
+
+  start = time.perf_counter()
+  ast = Parser(tokens).parse()
+  times["parse"] = time.perf_counter() - start
+  if ast.error: raise Exception(ast.error.as_string())
+
+  start = time.perf_counter()
+  node = Optimizer().optimize(ast.node)
+  Resolver().resolve(node)
+  times["compile"] = time.perf_counter() - start
+
+  context = Context("<program>")
+  context.symbol_table = OverlaySymbolTable(BUILTINS)
+  start = time.perf_counter()
+  result = main.EXECUTION_MODES[mode]().visit(node, context)
+  times["run"] = time.perf_counter() - start
+  if result.error: raise Exception(result.error.as_string())
+
+  return times
+
+def peak_memory(script:str, lexer:str, mode:str) -> int:
+  gc.collect()
+  tracemalloc.start()
+  try:
+    run_stages(script, lexer, mode)
+    _, peak = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+  return peak
+
+# Like the times, peak memory is the best of the repeats (tracemalloc is slow, so at most
+# MEMORY_REPEAT of them)
+MEMORY_REPEAT = 3
+
+def measure(script:str, lexer:str, mode:str, repeat:int) -> dict:
+  best = {}
+  for _ in range(repeat):
+    gc.collect()
+    for stage, elapsed in run_stages(script, lexer, mode).items():
+      best[stage] = elapsed if stage not in best else min(best[stage], elapsed)
+
+  counts = work(script, lexer)
+  result = {}
+  for stage in STAGES:
+    unit = UNITS[stage]
+    result[stage] = {"seconds": best[stage], unit: counts[unit], f"{unit}_per_sec": counts[unit] / best[stage] if best[stage] > 0 else None}
+  result["peak_memory_bytes"] = min(peak_memory(script, lexer, mode) for _ in range(min(repeat, MEMORY_REPEAT)))
+  return result
+
+# Stages faster than this and peak memory growing by less than this are too noisy to compare
+# against a baseline
+MIN_COMPARED_SECONDS = 0.001
+MIN_COMPARED_BYTES = 64 * 1024
+
+def regressions(report:dict, baseline:dict, time_threshold:float, memory_threshold:float) -> list:
+  found = []
+  for name, result in report["results"].items():
+    previous = baseline["results"].get(name)
+    if previous is None: continue
+
+    for stage in STAGES:
+      old, new = previous[stage]["seconds"], result[stage]["seconds"]
+      if old >= MIN_COMPARED_SECONDS and new > old * (1 + time_threshold):
+        found.append(f"{name} {stage}: {old:.4f}s -> {new:.4f}s ({(new / old - 1) * 100:+.1f}%)")
+
+    old, new = previous["peak_memory_bytes"], result["peak_memory_bytes"]
+    if new - old >= MIN_COMPARED_BYTES and new > old * (1 + memory_threshold):
+      found.append(f"{name} peak memory: {old} -> {new} bytes ({(new / old - 1) * 100:+.1f}%)")
+  return found
+
+if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser(description="Times lexing, parsing, compiling and running representative scripts, reports JSON and checks it against a baseline")
+  arg_parser.add_argument("--script", choices=list(SCRIPTS.keys()), action="append")
+  arg_parser.add_argument("--mode", choices=list(main.EXECUTION_MODES.keys()), default="interpreter")
+  arg_parser.add_argument("--lexer", choices=list(main.LEXERS.keys()), default="regex")
+  arg_parser.add_argument("--repeat", type=int, default=5)
+  arg_parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+  arg_parser.add_argument("--baseline", help="JSON report to compare against, exits with 1 on a regression. Times only compare on one machine, so record it with --save-baseline where the check runs")
+  arg_parser.add_argument("--save-baseline", help="Also write the JSON report to this file")
+  arg_parser.add_argument("--time-threshold", type=float, default=0.15, help="Allowed slowdown of a stage, as a fraction")
+  arg_parser.add_argument("--memory-threshold", type=float, default=0.10, help="Allowed growth of peak memory, as a fraction")
+  args = arg_parser.parse_args()
+
+  report = {
+    "python": platform.python_version(),
+    "mode": args.mode,
+    "lexer": args.lexer,
+    "repeat": args.repeat,
+    "results": {name: measure(SCRIPTS[name], args.lexer, args.mode, args.repeat) for name in args.script or list(SCRIPTS.keys())}
+  }
+
+  text = json.dumps(report, indent=2)
+  if args.output:
+    with open(args.output, "w") as file:
+      file.write(text + "\n")
+  else:
+    print(text)
+
+  if args.save_baseline:
+    with open(args.save_baseline, "w") as file:
+      file.write(text + "\n")
+
+  if args.baseline:
+    with open(args.baseline) as file:
+      baseline = json.load(file)
+    if baseline.get("mode") != args.mode or baseline.get("lexer") != args.lexer:
+      print(f"Baseline was recorded with mode {baseline.get('mode')} and lexer {baseline.get('lexer')}", file=sys.stderr)
+      sys.exit(2)
+
+    found = regressions(report, baseline, args.time_threshold, args.memory_threshold)
+    for regression in found:
+      print(f"Regression: {regression}", file=sys.stderr)
+    if found: sys.exit(1)
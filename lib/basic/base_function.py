@@ -8,11 +8,11 @@ from .error import RTError
 def populate_args(arg_names:list, args:list, exec_ctx:Context):
   for i in range(len(args)):
     arg_name = arg_names[i]
-    arg_value = args[i]
-    arg_value.set_context(exec_ctx)
-    exec_ctx.symbol_table.set(arg_name, arg_value)
+    exec_ctx.symbol_table.set(arg_name, args[i])
 
 class BaseFunction(Value):
+  __slots__ = ("name",)
+
   def __init__(self, name:Union[str, None]):
     super(BaseFunction, self).__init__()
     self.name = name or "<anonymous>"
@@ -0,0 +1,77 @@
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Union
+from .position import Position
+from .context import Context
+from .error import BudgetExceededError
+
+# Default sizes, so a budget that only sets a timeout still reports a value too large to build instead
+# of running out of memory, or computing a single huge number past any deadline
+MAX_LIST_LENGTH = 1 << 22
+MAX_STRING_LENGTH = 1 << 24
+MAX_NUMBER_BITS = 1 << 20
+
+# Limits of one run, None leaves a limit off. Steps, time and call depth are counted by a
+# BudgetedInterpreter, list, string and number sizes are checked by the operations that can build a
+# huge value in one step (repetition, concatenation, powers, loops, printing, RANGE, APPEND and EXTEND).
+class Budget:
+  def __init__(self, max_steps:Union[int, None]=None, timeout:Union[float, None]=None, max_list_length:Union[int, None]=MAX_LIST_LENGTH, max_string_length:Union[int, None]=MAX_STRING_LENGTH, max_call_depth:Union[int, None]=None, max_number_bits:Union[int, None]=MAX_NUMBER_BITS):
+    self.max_steps = max_steps
+    self.timeout = timeout
+    self.max_list_length = max_list_length
+    self.max_string_length = max_string_length
+    self.max_call_depth = max_call_depth
+    self.max_number_bits = max_number_bits
+
+    self.steps = 0
+    self.depth = 0
+    self.deadline:Union[float, None] = None
+    # The BudgetedInterpreter made for this budget, runs work that was deferred by an earlier run
+    self.interpreter = None
+
+  def start(self):
+    self.steps = 0
+    self.depth = 0
+    self.deadline = None if self.timeout is None else perf_counter() + self.timeout
+
+# Budget of the run in progress, every thread (and asyncio task) sees only its own run
+active_budget:ContextVar = ContextVar("active_budget", default=None)
+
+# Interpreter for deferred work (producers of lazy lists), the run forcing it pays for it
+def forcing_interpreter(interpreter):
+  budget = active_budget.get()
+  if budget is None or budget.interpreter is None: return interpreter
+  return budget.interpreter
+
+def list_length_limit() -> Union[int, None]:
+  budget = active_budget.get()
+  return None if budget is None else budget.max_list_length
+
+def list_length_error(length:int, pos_start:Position, pos_end:Position, context:Context) -> Union[BudgetExceededError, None]:
+  budget = active_budget.get()
+  if budget is None or budget.max_list_length is None or length <= budget.max_list_length: return None
+  return BudgetExceededError(pos_start, pos_end, f"List would have {length} elements, the budget allows {budget.max_list_length}", context)
+
+def string_length_error(length:int, pos_start:Position, pos_end:Position, context:Context) -> Union[BudgetExceededError, None]:
+  budget = active_budget.get()
+  if budget is None or budget.max_string_length is None or length <= budget.max_string_length: return None
+  return BudgetExceededError(pos_start, pos_end, f"String would have {length} characters, the budget allows {budget.max_string_length}", context)
+
+# Printed text is a string too, but a list sharing its stores can print exponentially more than it holds
+def printed_length_limit() -> Union[int, None]:
+  budget = active_budget.get()
+  return None if budget is None else budget.max_string_length
+
+def printed_length_error(length:int, pos_start:Position, pos_end:Position, context:Context) -> Union[BudgetExceededError, None]:
+  limit = printed_length_limit()
+  if limit is None or length <= limit: return None
+  return BudgetExceededError(pos_start, pos_end, f"Printed text would have {length} characters, the budget allows {limit}", context)
+
+def number_bits_limit() -> Union[int, None]:
+  budget = active_budget.get()
+  return None if budget is None else budget.max_number_bits
+
+def number_bits_error(bits:int, pos_start:Position, pos_end:Position, context:Context) -> Union[BudgetExceededError, None]:
+  budget = active_budget.get()
+  if budget is None or budget.max_number_bits is None or bits <= budget.max_number_bits: return None
+  return BudgetExceededError(pos_start, pos_end, f"Number would have about {bits} bits, the budget allows {budget.max_number_bits}", context)
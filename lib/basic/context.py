@@ -2,6 +2,8 @@ from typing import Union
 from .symbol_table import SymbolTable
 
 class Context:
+  __slots__ = ("display_name", "parent", "parent_entry_pos", "symbol_table")
+
   def __init__(self, display_name:str, parent=None, parent_entry_pos=None):
     self.display_name = display_name
     self.parent = parent
@@ -44,13 +44,18 @@ class RTError(Error):
     return colored(result, "red")
 
   def generate_traceback(self):
-    result = ""
+    lines = []
     pos = self.pos_start
     ctx = self.context
 
     while ctx:
-      result = f"  File {pos.fn}, line {str(pos.ln + 1)}, in {ctx.display_name}\n" + result
+      lines.append(f"  File {pos.fn}, line {str(pos.ln + 1)}, in {ctx.display_name}\n")
       pos = ctx.parent_entry_pos
       ctx = ctx.parent
 
-    return "Traceback (most recent call last):\n" + result
+    return "Traceback (most recent call last):\n" + "".join(reversed(lines))
+
+class BudgetExceededError(RTError):
+  def __init__(self, pos_start:Union[None, Position], pos_end:Union[None, Position], details="", context:Union[Context, None]=None):
+    super().__init__(pos_start, pos_end, details, context)
+    self.error_name = 'Budget exceeded'
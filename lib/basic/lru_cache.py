@@ -0,0 +1,27 @@
+from collections import OrderedDict
+
+# Keeps the max_entries most recently used values, for what is compiled per node by an engine that
+# lives across many scripts
+class LRUCache:
+  __slots__ = ("max_entries", "entries")
+
+  def __init__(self, max_entries:int):
+    self.max_entries = max_entries
+    self.entries = OrderedDict()
+
+  def get(self, key):
+    value = self.entries.get(key)
+    if value is not None: self.entries.move_to_end(key)
+    return value
+
+  def put(self, key, value):
+    self.entries[key] = value
+    self.entries.move_to_end(key)
+    while len(self.entries) > self.max_entries:
+      self.entries.popitem(last=False)
+
+  def clear(self):
+    self.entries.clear()
+
+  def __len__(self):
+    return len(self.entries)
@@ -0,0 +1,161 @@
+from typing import Iterable, Iterator, Union
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+def new_path(level:int, node:tuple) -> tuple:
+  while level > 0:
+    node = (node,)
+    level -= BITS
+  return node
+
+# count includes the leaf being pushed, it always goes to the right edge of the trie
+def push_tail(count:int, level:int, parent:tuple, leaf:tuple) -> tuple:
+  index = ((count - 1) >> level) & MASK
+  if level == BITS:
+    child = leaf
+  elif index < len(parent):
+    child = push_tail(count, level - BITS, parent[index], leaf)
+  else:
+    child = new_path(level - BITS, leaf)
+  return parent[:index] + (child,)
+
+def push_leaf(count:int, shift:int, root:tuple, leaf:tuple) -> (int, tuple):
+  if (count >> BITS) > (1 << shift):
+    return shift + BITS, (root, new_path(shift, leaf))
+  return shift, push_tail(count, shift, root, leaf)
+
+def pop_tail(count:int, level:int, node:tuple) -> Union[tuple, None]:
+  index = ((count - 2) >> level) & MASK
+  if level > BITS:
+    child = pop_tail(count, level - BITS, node[index])
+    if child is None:
+      return node[:index] if index > 0 else None
+    return node[:index] + (child,)
+  return node[:index] if index > 0 else None
+
+# Immutable vector, every update returns a new one sharing all untouched nodes with the old. Elements
+# live in a 32 way trie of tuples plus a tail holding the last (up to) 32 of them, so appending and
+# removing the last element copy at most one path of the trie. Elements before start were removed
+# from the front, the trie keeps them until they outnumber the rest.
+class PVector:
+  __slots__ = ("count", "shift", "root", "tail", "start")
+
+  def __init__(self, count:int=0, shift:int=BITS, root:tuple=(), tail:tuple=(), start:int=0):
+    # Positions in the trie, so count includes the removed front
+    self.count = count
+    self.shift = shift
+    self.root = root
+    self.tail = tail
+    self.start = start
+
+  @classmethod
+  def from_iterable(cls, values:Iterable):
+    return EMPTY.extend(values)
+
+  def tail_offset(self) -> int:
+    return self.count - len(self.tail)
+
+  def leaf_for(self, position:int) -> tuple:
+    if position >= self.count - len(self.tail): return self.tail
+
+    node = self.root
+    level = self.shift
+    while level > 0:
+      node = node[(position >> level) & MASK]
+      level -= BITS
+    return node
+
+  # Position in the trie of an index
+  def normalize(self, index:int) -> int:
+    if not isinstance(index, int):
+      raise TypeError("vector indices must be integers")
+    length = self.count - self.start
+    if index < 0: index += length
+    if not 0 <= index < length:
+      raise IndexError("vector index out of range")
+    return index + self.start
+
+  def append(self, value):
+    if len(self.tail) < WIDTH:
+      return PVector(self.count + 1, self.shift, self.root, self.tail + (value,), self.start)
+
+    shift, root = push_leaf(self.count, self.shift, self.root, self.tail)
+    return PVector(self.count + 1, shift, root, (value,), self.start)
+
+  def extend(self, values:Iterable):
+    if not isinstance(values, (tuple, list)): values = tuple(values)
+    if not values: return self
+
+    count, shift, root, tail = self.count, self.shift, self.root, self.tail
+    room = WIDTH - len(tail)
+    top_up = tuple(values[:room])
+    tail += top_up
+    count += len(top_up)
+
+    for start in range(room, len(values), WIDTH):
+      shift, root = push_leaf(count, shift, root, tail)
+      tail = tuple(values[start:start + WIDTH])
+      count += len(tail)
+
+    return PVector(count, shift, root, tail, self.start)
+
+  def pop(self):
+    if self.count == self.start: raise IndexError("pop from empty vector")
+    if self.count - self.start == 1: return EMPTY
+    if len(self.tail) > 1:
+      return PVector(self.count - 1, self.shift, self.root, self.tail[:-1], self.start)
+
+    tail = self.leaf_for(self.count - 2)
+    root = pop_tail(self.count, self.shift, self.root)
+    shift = self.shift
+    if root is None: root = ()
+    if shift > BITS and len(root) == 1:
+      root = root[0]
+      shift -= BITS
+    return PVector(self.count - 1, shift, root, tail, self.start)
+
+  # Removing the first element only moves start and removing from the tail shares the whole trie,
+  # anywhere else every later element moves and the vector is rebuilt
+  def remove(self, index:int):
+    position = self.normalize(index)
+    if position == self.count - 1: return self.pop()
+
+    if position == self.start:
+      # Rebuilt once the removed front outnumbers the elements, so each removal costs O(1) on average
+      if position + 1 > self.count - position - 1: return PVector.from_iterable(self.values_from(position + 1))
+      return PVector(self.count, self.shift, self.root, self.tail, position + 1)
+
+    tail_offset = self.tail_offset()
+    if position >= tail_offset:
+      offset = position - tail_offset
+      return PVector(self.count - 1, self.shift, self.root, self.tail[:offset] + self.tail[offset + 1:], self.start)
+
+    elements = list(self)
+    del elements[position - self.start]
+    return PVector.from_iterable(elements)
+
+  def values_from(self, position:int) -> Iterator:
+    tail_offset = self.tail_offset()
+    if position < tail_offset:
+      yield from self.leaf_for(position)[position & MASK:]
+      for leaf_start in range((position | MASK) + 1, tail_offset, WIDTH):
+        yield from self.leaf_for(leaf_start)
+      position = tail_offset
+    yield from self.tail[position - tail_offset:]
+
+  def __getitem__(self, index:int):
+    position = self.normalize(index)
+    return self.leaf_for(position)[position & MASK]
+
+  def __len__(self) -> int:
+    return self.count - self.start
+
+  def __iter__(self) -> Iterator:
+    return self.values_from(self.start)
+
+  def __repr__(self):
+    return "[" + ", ".join([repr(x) for x in self]) + "]"
+
+EMPTY = PVector()
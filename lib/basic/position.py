@@ -1,20 +1,51 @@
+from bisect import bisect_left
+from typing import Union
+
+# Source text shared by every position in it, the line offset index is only built when a line or
+# column is asked for (error reporting)
+class Source:
+  __slots__ = ("fn", "text", "newline_offsets")
+
+  def __init__(self, fn:str, text:str):
+    self.fn = fn
+    self.text = text
+    self.newline_offsets:Union[list, None] = None
+
+  def line_column(self, idx:int) -> tuple:
+    if self.newline_offsets is None:
+      offsets = []
+      offset = self.text.find('\n')
+      while offset >= 0:
+        offsets.append(offset)
+        offset = self.text.find('\n', offset + 1)
+      self.newline_offsets = offsets
+
+    ln = bisect_left(self.newline_offsets, idx)
+    col = idx - self.newline_offsets[ln - 1] - 1 if ln > 0 else idx
+    return ln, col
+
 class Position:
-  def __init__(self, idx, ln, col, fn, ftxt):
+  __slots__ = ("idx", "source")
+
+  def __init__(self, idx:int, source:Source):
     self.idx = idx
-    self.ln = ln
-    self.col = col
-    self.fn = fn
-    self.ftxt = ftxt
+    self.source = source
+
+  @property
+  def ln(self) -> int:
+    return self.source.line_column(self.idx)[0]
 
-  def advance(self, current_char=None):
-    self.idx += 1
-    self.col += 1
+  @property
+  def col(self) -> int:
+    return self.source.line_column(self.idx)[1]
 
-    if current_char == '\n':
-      self.ln += 1
-      self.col = 0
+  @property
+  def fn(self) -> str:
+    return self.source.fn
 
-    return self
+  @property
+  def ftxt(self) -> str:
+    return self.source.text
 
   def copy(self):
-    return Position(self.idx, self.ln, self.col, self.fn, self.ftxt)
\ No newline at end of file
+    return Position(self.idx, self.source)
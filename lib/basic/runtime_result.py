@@ -2,6 +2,8 @@ from typing import Union
 from .error import ErrorBase
 
 class RTResult:
+  __slots__ = ("value", "error")
+
   def __init__(self):
     self.value = None
     self.error:Union[None, ErrorBase] = None
@@ -1,16 +1,24 @@
+from typing import Union
+
 class SymbolTable:
   def __init__(self, parent=None):
     self.symbols = {}
-    self.protected_names = []
+    self.protected_names = set()
     self.parent = parent
 
   def get(self, name:str):
-    value = self.symbols.get(name, None)
+    table = self
+    while table is not None:
+      value = table.lookup(name)
+      if value is not None: return value
+      table = table.next_table(name)
+    return None
 
-    if value is None and self.parent is not None:
-      return self.parent.get(name, None)
+  def lookup(self, name:str):
+    return self.symbols.get(name, None)
 
-    return value
+  def next_table(self, name:str):
+    return self.parent
 
   def exists(self, name:str):
     if name in self.protected_names: return False
@@ -21,11 +29,75 @@ class SymbolTable:
 
     self.symbols[name] = value
 
-    if protected and name not in self.protected_names:
-      self.protected_names.append(name)
+    if protected:
+      self.protected_names.add(name)
     return True
 
   def delete(self, name:str):
     if name in self.protected_names: return False
     del self.symbols[name]
-    return True
\ No newline at end of file
+    return True
+
+# Symbol table of a function call, names resolved by the Resolver live in slots instead of the dict
+class FrameSymbolTable(SymbolTable):
+  # Bumped whenever a frame stores a name outside its layout, which invalidates every outer link
+  dict_generation = 0
+
+  def __init__(self, layout:dict, parent:Union[SymbolTable, None]=None):
+    super(FrameSymbolTable, self).__init__(parent)
+    self.layout = layout
+    self.slots = [None] * len(layout)
+
+    # Recursion stacks frames of one function, a name outside its layout can't be in any of them, so
+    # lookups of such names jump straight past the whole run of frames
+    if isinstance(parent, FrameSymbolTable) and parent.layout is layout and not parent.symbols:
+      self.outer = parent.outer
+    else:
+      self.outer = parent
+    self.generation = FrameSymbolTable.dict_generation
+
+  def next_table(self, name:str):
+    if self.generation == FrameSymbolTable.dict_generation and name not in self.layout: return self.outer
+    return self.parent
+
+  def lookup(self, name:str):
+    slot = self.layout.get(name)
+    if slot is not None and self.slots[slot] is not None: return self.slots[slot]
+    return self.symbols.get(name, None)
+
+  def exists(self, name:str):
+    if name in self.protected_names: return False
+    slot = self.layout.get(name)
+    if slot is not None: return self.slots[slot] is not None
+    return name in self.symbols.keys()
+
+  def set(self, name:str, value, protected:bool=False):
+    slot = self.layout.get(name)
+    if slot is None or protected:
+      FrameSymbolTable.dict_generation += 1
+      return super(FrameSymbolTable, self).set(name, value, protected)
+    if name in self.protected_names: return False
+
+    self.slots[slot] = value
+    return True
+
+  def delete(self, name:str):
+    slot = self.layout.get(name)
+    if slot is None: return super(FrameSymbolTable, self).delete(name)
+    if name in self.protected_names: return False
+
+    self.slots[slot] = None
+    return True
+
+# Global scope layered over a shared table (the builtins). Names are set in the overlay and read
+# through to the base, so creating one copies nothing and the base never changes.
+class OverlaySymbolTable(SymbolTable):
+  def __init__(self, base:SymbolTable):
+    super(OverlaySymbolTable, self).__init__(base)
+    # Protected names of the base stay protected, the set is only copied once the overlay adds one
+    self.protected_names = base.protected_names
+
+  def set(self, name:str, value, protected:bool=False):
+    if protected and self.protected_names is self.parent.protected_names:
+      self.protected_names = set(self.protected_names)
+    return super(OverlaySymbolTable, self).set(name, value, protected)
@@ -0,0 +1,17 @@
+from typing import Union
+from .context import Context
+
+# Returned instead of a value by a call in tail position of a function body, the caller's
+# Function.execute then runs it in its own loop instead of growing the Python stack
+class TailCall:
+  __slots__ = ("function", "args", "location")
+
+  def __init__(self, function, args:list):
+    self.function = function
+    self.args = args
+    self.location:Union[tuple, None] = None
+
+  def locate(self, node, context:Context):
+    if self.location is None:
+      self.location = (node, context)
+    return self
@@ -5,6 +5,8 @@ from .context import Context
 from .runtime_result import RTResult
 
 class Value:
+  __slots__ = ("pos_start", "pos_end", "context")
+
   def __init__(self):
     self.pos_start:Union[Position, None] = None
     self.pos_end:Union[Position, None] = None
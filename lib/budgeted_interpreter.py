@@ -0,0 +1,81 @@
+from time import perf_counter
+from typing import Union
+from .basic.budget import Budget, active_budget, list_length_error, string_length_error
+from .basic.context import Context
+from .basic.error import BudgetExceededError
+from .basic.runtime_result import RTResult
+from .nodes import Node, CallNode, ConstantNode, ForNode, WhileNode
+from .interpreter import Interpreter
+from .string_val import String
+from .list_val import List
+
+# The clock is read every this many steps, and before every loop iteration and call, where one step
+# can take long (a huge multiplication or a builtin walking a long list)
+DEADLINE_CHECK_STEPS = 1024
+
+# Interpreter counting visited nodes and nested calls against the budget of the run in progress, a
+# lazy list made by an earlier run is forced under the budget of the run forcing it. Calls in tail
+# position return before the callee runs, so like the stack they don't add to the depth.
+class BudgetedInterpreter(Interpreter):
+  def __init__(self, budget:Budget):
+    budget.interpreter = self
+
+  def visit(self, node:Node, context:Context):
+    budget = active_budget.get()
+    if budget is None: return super(BudgetedInterpreter, self).visit(node, context)
+
+    budget.steps += 1
+    if budget.max_steps is not None and budget.steps > budget.max_steps:
+      return RTResult().failure(BudgetExceededError(node.pos_start, node.pos_end, f"Step budget of {budget.max_steps} exceeded", context))
+    if budget.deadline is not None and budget.steps % DEADLINE_CHECK_STEPS == 0 and perf_counter() > budget.deadline:
+      return RTResult().failure(self.time_error(budget, node, context))
+
+    return super(BudgetedInterpreter, self).visit(node, context)
+
+  def time_error(self, budget:Budget, node:Node, context:Context) -> BudgetExceededError:
+    return BudgetExceededError(node.pos_start, node.pos_end, f"Time budget of {budget.timeout} seconds exceeded", context)
+
+  def loop_visitor(self, node:Union[ForNode, WhileNode]):
+    visit = super(BudgetedInterpreter, self).loop_visitor(node)
+    budget = active_budget.get()
+    if budget is None or budget.deadline is None: return visit
+
+    def visit_iteration(body_node:Node, context:Context) -> RTResult:
+      if perf_counter() > budget.deadline: return RTResult().failure(self.time_error(budget, node, context))
+      return visit(body_node, context)
+    return visit_iteration
+
+  def visit_CallNode(self, node:CallNode, context:Context) -> RTResult:
+    budget = active_budget.get()
+    if budget is None: return super(BudgetedInterpreter, self).visit_CallNode(node, context)
+    if budget.max_call_depth is not None and budget.depth >= budget.max_call_depth:
+      return RTResult().failure(BudgetExceededError(node.pos_start, node.pos_end, f"Call depth budget of {budget.max_call_depth} exceeded", context))
+    if budget.deadline is not None and perf_counter() > budget.deadline:
+      return RTResult().failure(self.time_error(budget, node, context))
+
+    budget.depth += 1
+    try:
+      return super(BudgetedInterpreter, self).visit_CallNode(node, context)
+    finally:
+      budget.depth -= 1
+
+  # Constants are folded before there is a budget, so their sizes are checked when they are used
+  def visit_ConstantNode(self, node:ConstantNode, context:Context) -> RTResult:
+    if active_budget.get() is not None:
+      if node.sizes is None: node.sizes = constant_sizes(node.value)
+      list_length, string_length = node.sizes
+      error = list_length_error(list_length, node.pos_start, node.pos_end, context) or string_length_error(string_length, node.pos_start, node.pos_end, context)
+      if error: return RTResult().failure(error)
+    return super(BudgetedInterpreter, self).visit_ConstantNode(node, context)
+
+# Longest list and longest string in a folded value
+def constant_sizes(value) -> tuple:
+  if isinstance(value, String): return 0, value.length
+  if not isinstance(value, List): return 0, 0
+
+  list_length, string_length = value.length(), 0
+  for element in value.elements:
+    if isinstance(element, (String, List)):
+      sizes = constant_sizes(element)
+      list_length, string_length = max(list_length, sizes[0]), max(string_length, sizes[1])
+  return list_length, string_length
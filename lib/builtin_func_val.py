@@ -1,14 +1,21 @@
 import os
+from math import ceil, isfinite
 from typing import Union
 from .basic.base_function import BaseFunction
 from .basic.runtime_result import RTResult
 from .basic.context import Context
 from .basic.error import RTError
-from .number_val import Number
+from .basic.budget import list_length_error, printed_length_limit, printed_length_error, number_bits_limit, number_bits_error
+from .number_val import Number, loop_range
 from .string_val import String
-from .list_val import List
+from .list_val import List, ListStore
+from .function_val import RepeatedCall
+from .memoized_function_val import MemoizedFunction, MemoCache
+from . import vectorized
 
 class BuildInFunction(BaseFunction):
+  __slots__ = ()
+
   def __init__(self, name: Union[str, None]):
     super(BuildInFunction, self).__init__(name)
 
@@ -23,7 +30,13 @@ class BuildInFunction(BaseFunction):
     res.register(self.check_and_populate_args(method.arg_names, args, exec_ctx))
     if res.error: return res
 
-    return_value = res.register(method(exec_ctx))
+    takes_interpreter = getattr(method, "takes_interpreter", False)
+    if interpreter.hooks is not None:
+      return_value = res.register(interpreter.hooks.traced_call(self, exec_ctx, lambda: method(exec_ctx, interpreter) if takes_interpreter else method(exec_ctx)))
+    elif takes_interpreter:
+      return_value = res.register(method(exec_ctx, interpreter))
+    else:
+      return_value = res.register(method(exec_ctx))
     if res.error: return res
 
     return res.success(return_value)
@@ -37,14 +50,32 @@ class BuildInFunction(BaseFunction):
   def __repr__(self):
     return f"<built-in function {self.name}>"
 
+  # Produces everything a printed value shows and measures its text before building it, a list
+  # sharing its stores can show exponentially more than it holds
+  def printable_error(self, value, exec_context: Context):
+    if isinstance(value, String): return printed_length_error(value.length, self.pos_start, self.pos_end, exec_context)
+    if not isinstance(value, List): return printed_length_error(len(str(value)), self.pos_start, self.pos_end, exec_context)
+
+    error = value.materialize_all()
+    if error or printed_length_limit() is None: return error
+    return printed_length_error(value.text_length({}), self.pos_start, self.pos_end, exec_context)
+
   def execute_print(self, exec_context: Context) -> RTResult:
-    print(str(exec_context.symbol_table.get("value")))
+    value = exec_context.symbol_table.get("value")
+    error = self.printable_error(value, exec_context)
+    if error: return RTResult().failure(error)
+
+    print(str(value))
     return RTResult().success(Number.null())
 
   execute_print.arg_names = ["value"]
 
   def execute_print_ret(self, exec_context: Context) -> RTResult:
-    return RTResult().success(String(str(exec_context.symbol_table.get("value"))))
+    value = exec_context.symbol_table.get("value")
+    error = self.printable_error(value, exec_context)
+    if error: return RTResult().failure(error)
+
+    return RTResult().success(String(str(value)))
 
   execute_print_ret.arg_names = ["value"]
 
@@ -105,7 +136,10 @@ class BuildInFunction(BaseFunction):
     if not isinstance(list_, List):
       return RTResult().failure(RTError(self.pos_start, self.pos_end, "First argument must be list", exec_context))
 
-    list_.elements.append(value)
+    error = list_.materialize() or list_length_error(list_.length() + 1, self.pos_start, self.pos_end, exec_context)
+    if error: return RTResult().failure(error)
+
+    list_.elements = list_.elements.append(value)
     return RTResult().success(Number.null())
 
   execute_append.arg_names = ["list", "value"]
@@ -120,8 +154,12 @@ class BuildInFunction(BaseFunction):
     if not isinstance(index, Number):
       return RTResult().failure(RTError(self.pos_start, self.pos_end, "Second argument must be number", exec_context))
 
+    error = list_.materialize()
+    if error: return RTResult().failure(error)
+
     try:
-      element = list_.elements.pop(index.value)
+      element = list_.elements[index.value]
+      list_.elements = list_.elements.remove(index.value)
     except:
       return RTResult().failure(RTError(self.pos_start, self.pos_end, "Element of that index could not be removed because that index doesn't exist", exec_context))
 
@@ -139,11 +177,201 @@ class BuildInFunction(BaseFunction):
     if not isinstance(listB, List):
       return RTResult().failure(RTError(self.pos_start, self.pos_end, "Second argument must be list", exec_context))
 
-    listA.elements.extend(listB.elements)
+    error = listA.materialize() or listB.materialize() or list_length_error(listA.length() + listB.length(), self.pos_start, self.pos_end, exec_context)
+    if error: return RTResult().failure(error)
+
+    listA.elements = listA.elements.extend(listB.elements)
     return RTResult().success(Number.null())
 
   execute_extend.arg_names = ["listA", "listB"]
 
+  def execute_vecop(self, exec_context: Context) -> RTResult:
+    list_ = exec_context.symbol_table.get("list")
+    operator = exec_context.symbol_table.get("operator")
+    other = exec_context.symbol_table.get("other")
+
+    if not isinstance(list_, List):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "First argument must be list", exec_context))
+
+    if not isinstance(operator, String) or operator.value not in vectorized.OPERATORS:
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Second argument must be one of " + ", ".join(vectorized.OPERATORS), exec_context))
+
+    if not isinstance(other, (Number, List)):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Third argument must be number or list", exec_context))
+
+    error = list_.materialize() or (other.materialize() if isinstance(other, List) else None)
+    if error: return RTResult().failure(error)
+
+    left = list_.numbers()
+    if left is None:
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "First argument must be list of numbers", exec_context))
+
+    right = other.value if isinstance(other, Number) else other.numbers()
+    if right is None:
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Third argument must be number or list of numbers", exec_context))
+
+    error = list_length_error(len(left), self.pos_start, self.pos_end, exec_context)
+    if error is None and number_bits_limit() is not None:
+      error = number_bits_error(vectorized.result_bits(operator.value, left, right), self.pos_start, self.pos_end, exec_context)
+    if error: return RTResult().failure(error)
+
+    numbers, message = vectorized.apply(operator.value, left, right)
+    if message:
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, message, exec_context))
+
+    return RTResult().success(List(ListStore(None, numbers)))
+
+  execute_vecop.arg_names = ["list", "operator", "other"]
+
+  def execute_map(self, exec_context: Context, interpreter) -> RTResult:
+    list_ = exec_context.symbol_table.get("list")
+    function = exec_context.symbol_table.get("function")
+
+    if not isinstance(list_, List):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "First argument must be list", exec_context))
+
+    if not isinstance(function, BaseFunction):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Second argument must be function", exec_context))
+
+    error = list_.materialize()
+    if error: return RTResult().failure(error)
+
+    call = RepeatedCall(function.copy().set_position(self.pos_start, self.pos_end).set_context(exec_context), interpreter).call
+    elements = []
+    for element in list_.elements:
+      res = call([element])
+      if res.error: return res
+      elements.append(res.value)
+
+    return RTResult().success(List(elements))
+
+  execute_map.arg_names = ["list", "function"]
+  execute_map.takes_interpreter = True
+
+  def execute_filter(self, exec_context: Context, interpreter) -> RTResult:
+    list_ = exec_context.symbol_table.get("list")
+    function = exec_context.symbol_table.get("function")
+
+    if not isinstance(list_, List):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "First argument must be list", exec_context))
+
+    if not isinstance(function, BaseFunction):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Second argument must be function", exec_context))
+
+    error = list_.materialize()
+    if error: return RTResult().failure(error)
+
+    call = RepeatedCall(function.copy().set_position(self.pos_start, self.pos_end).set_context(exec_context), interpreter).call
+    elements = []
+    for element in list_.elements:
+      res = call([element])
+      if res.error: return res
+      if res.value is not None and res.value.is_true(): elements.append(element)
+
+    return RTResult().success(List(elements))
+
+  execute_filter.arg_names = ["list", "function"]
+  execute_filter.takes_interpreter = True
+
+  def execute_reduce(self, exec_context: Context, interpreter) -> RTResult:
+    list_ = exec_context.symbol_table.get("list")
+    function = exec_context.symbol_table.get("function")
+    accumulator = exec_context.symbol_table.get("initial")
+
+    if not isinstance(list_, List):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "First argument must be list", exec_context))
+
+    if not isinstance(function, BaseFunction):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Second argument must be function", exec_context))
+
+    error = list_.materialize()
+    if error: return RTResult().failure(error)
+
+    call = RepeatedCall(function.copy().set_position(self.pos_start, self.pos_end).set_context(exec_context), interpreter).call
+    for element in list_.elements:
+      res = call([accumulator, element])
+      if res.error: return res
+      accumulator = res.value
+
+    return RTResult().success(accumulator)
+
+  execute_reduce.arg_names = ["list", "function", "initial"]
+  execute_reduce.takes_interpreter = True
+
+  def execute_sum(self, exec_context: Context) -> RTResult:
+    list_ = exec_context.symbol_table.get("list")
+
+    if not isinstance(list_, List):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Argument must be list", exec_context))
+
+    error = list_.materialize()
+    if error: return RTResult().failure(error)
+
+    numbers = list_.numbers()
+    if numbers is None:
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Argument must be list of numbers", exec_context))
+
+    return RTResult().success(Number.make(sum(vectorized.plain(numbers))))
+
+  execute_sum.arg_names = ["list"]
+
+  def execute_len(self, exec_context: Context) -> RTResult:
+    value = exec_context.symbol_table.get("value")
+
+    if isinstance(value, String):
+      return RTResult().success(Number.make(value.length))
+
+    if not isinstance(value, List):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Argument must be list or string", exec_context))
+
+    error = value.materialize()
+    if error: return RTResult().failure(error)
+
+    return RTResult().success(Number.make(value.length()))
+
+  execute_len.arg_names = ["value"]
+
+  def execute_range(self, exec_context: Context) -> RTResult:
+    start = exec_context.symbol_table.get("start")
+    end = exec_context.symbol_table.get("end")
+
+    if not isinstance(start, Number) or not isinstance(end, Number):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Arguments must be numbers", exec_context))
+
+    span = end.value - start.value
+    error = list_length_error(max(0, ceil(span)) if isfinite(span) else span, self.pos_start, self.pos_end, exec_context)
+    if error: return RTResult().failure(error)
+
+    numbers = vectorized.pack(list(loop_range(start.value, end.value, 1)))
+    return RTResult().success(List(ListStore(None, numbers)))
+
+  execute_range.arg_names = ["start", "end"]
+
+  def execute_memoize(self, exec_context: Context) -> RTResult:
+    function = exec_context.symbol_table.get("function")
+    size = exec_context.symbol_table.get("size")
+
+    if not isinstance(function, BaseFunction):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "First argument must be function", exec_context))
+
+    if not isinstance(size, Number) or not isinstance(size.value, int) or size.value < 1:
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Second argument must be positive integer", exec_context))
+
+    return RTResult().success(MemoizedFunction(function, MemoCache(size.value)))
+
+  execute_memoize.arg_names = ["function", "size"]
+
+  def execute_memo_stats(self, exec_context: Context) -> RTResult:
+    function = exec_context.symbol_table.get("function")
+
+    if not isinstance(function, MemoizedFunction):
+      return RTResult().failure(RTError(self.pos_start, self.pos_end, "Argument must be memoized function", exec_context))
+
+    cache = function.cache
+    return RTResult().success(List([Number.make(cache.hits), Number.make(cache.misses), Number.make(len(cache.entries))]))
+
+  execute_memo_stats.arg_names = ["function"]
+
   @classmethod
   def print(cls):
     return BuildInFunction("print")
@@ -190,4 +418,40 @@ class BuildInFunction(BaseFunction):
 
   @classmethod
   def extend(cls):
-    return BuildInFunction("extend")
\ No newline at end of file
+    return BuildInFunction("extend")
+
+  @classmethod
+  def vecop(cls):
+    return BuildInFunction("vecop")
+
+  @classmethod
+  def map(cls):
+    return BuildInFunction("map")
+
+  @classmethod
+  def filter(cls):
+    return BuildInFunction("filter")
+
+  @classmethod
+  def reduce(cls):
+    return BuildInFunction("reduce")
+
+  @classmethod
+  def sum(cls):
+    return BuildInFunction("sum")
+
+  @classmethod
+  def len(cls):
+    return BuildInFunction("len")
+
+  @classmethod
+  def range(cls):
+    return BuildInFunction("range")
+
+  @classmethod
+  def memoize(cls):
+    return BuildInFunction("memoize")
+
+  @classmethod
+  def memo_stats(cls):
+    return BuildInFunction("memo_stats")
\ No newline at end of file
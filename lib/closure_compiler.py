@@ -0,0 +1,293 @@
+from typing import Callable
+from collections import deque
+from .basic.error import ErrorBase, RTError
+from .basic.context import Context
+from .basic.runtime_result import RTResult
+from .basic.lru_cache import LRUCache
+from .basic.tail_call import TailCall
+from .nodes import Node, BinOpNode, NumberNode, UnaryOpNode, VarAccessNode, VarAssignNode, IfNode, ForNode, WhileNode, FuncDefNode, CallNode, StringNode, ListNode, ConstantNode, VoidNode
+from .compiler import binary_operation_name
+from .function_val import Function
+from .number_val import Number, loop_range
+from .string_val import String
+from .list_val import List
+from .lazy_list_val import lazy_for, lazy_while
+from .optimizer import materialize_constant
+from .location import needs_location, located_value
+from . import tokenClass
+
+# Appends to a zero length deque, for loops whose results are discarded
+DISCARD = deque(maxlen=0).append
+
+class ErrorSignal(Exception):
+  def __init__(self, error:ErrorBase):
+    super(ErrorSignal, self).__init__()
+    self.error = error
+
+# Programs whose closures are kept, the compile cache keeps far fewer programs
+CLOSURE_CACHE_SIZE = 4096
+
+class ClosureCompiler:
+  # Only the Interpreter reports to hooks
+  hooks = None
+
+  def __init__(self):
+    self.closure_cache = LRUCache(CLOSURE_CACHE_SIZE)
+
+  def visit(self, node:Node, context:Context) -> RTResult:
+    closure = self.closure_cache.get(node)
+    if closure is None:
+      closure = self.compile(node)
+      self.closure_cache.put(node, closure)
+
+    try:
+      return RTResult().success(closure(context))
+    except ErrorSignal as signal:
+      return RTResult().failure(signal.error)
+
+  def compile(self, node:Node) -> Callable:
+    method_name = f"compile_{type(node).__name__}"
+    method = getattr(self, method_name, self.no_compile_method)
+    return method(node)
+
+  def no_compile_method(self, node:Node):
+    raise Exception(f"No compile_{type(node).__name__} method defined")
+
+  def compile_NumberNode(self, node:NumberNode) -> Callable:
+    number = Number.make(node.tok.value)
+
+    def number_value(context:Context):
+      return number
+    return number_value
+
+  def compile_StringNode(self, node:StringNode) -> Callable:
+    string = String(node.tok.value)
+
+    def string_value(context:Context):
+      return string
+    return string_value
+
+  def compile_VarAccessNode(self, node:VarAccessNode) -> Callable:
+    var_name = node.var_name_tok.value
+    pos_start, pos_end = node.pos_start, node.pos_end
+    slot = node.slot
+
+    if slot is not None:
+      def slot_access(context:Context):
+        value = context.symbol_table.slots[slot]
+        if value is None:
+          value = context.symbol_table.get(var_name)
+          if not value:
+            raise ErrorSignal(RTError(pos_start, pos_end, f"'{var_name}' is not defined", context))
+        return value
+      return slot_access
+
+    def var_access(context:Context):
+      value = context.symbol_table.get(var_name)
+      if not value:
+        raise ErrorSignal(RTError(pos_start, pos_end, f"'{var_name}' is not defined", context))
+      return value
+    return var_access
+
+  def compile_VarAssignNode(self, node:VarAssignNode) -> Callable:
+    var_name = node.var_name_tok.value
+    value_closure = self.compile(node.value_node)
+    name_pos_start, name_pos_end = node.var_name_tok.pos_start, node.var_name_tok.pos_end
+    slot = node.slot
+
+    if slot is not None:
+      def slot_assign(context:Context):
+        value = value_closure(context)
+        context.symbol_table.slots[slot] = value
+        return value
+      return slot_assign
+
+    def var_assign(context:Context):
+      value = value_closure(context)
+      if not context.symbol_table.set(var_name, value):
+        raise ErrorSignal(RTError(name_pos_start, name_pos_end, "Invalid identifier - Protected variable", context))
+      return value
+    return var_assign
+
+  def compile_BinOpNode(self, node:BinOpNode) -> Callable:
+    left_closure = self.compile(node.left_node)
+    right_closure = self.compile(node.right_node)
+    operation_name = binary_operation_name(node.op_tok)
+    left_node, right_node = node.left_node, node.right_node
+
+    def bin_op(context:Context):
+      left = left_closure(context)
+      right = right_closure(context)
+      result, error = getattr(left, operation_name)(right)
+      if error:
+        left = located_value(left_node, left, context)
+        right = located_value(right_node, right, context)
+        raise ErrorSignal(getattr(left, operation_name)(right)[1])
+      return result
+    return bin_op
+
+  def compile_UnaryOpNode(self, node:UnaryOpNode) -> Callable:
+    operand_closure = self.compile(node.node)
+    operand_node = node.node
+
+    if node.op_tok.type == tokenClass.TT_MINUS:
+      def negate(context:Context):
+        operand = operand_closure(context)
+        result, error = operand.multed_by(Number.make(-1))
+        if error: raise ErrorSignal(located_value(operand_node, operand, context).multed_by(Number.make(-1))[1])
+        return result
+      return negate
+
+    if node.op_tok.matches(tokenClass.TT_KEYWORD, "NOT"):
+      def not_op(context:Context):
+        operand = operand_closure(context)
+        result, error = operand.notted()
+        if error: raise ErrorSignal(located_value(operand_node, operand, context).notted()[1])
+        return result
+      return not_op
+
+    return operand_closure
+
+  def compile_located(self, node:Node) -> Callable:
+    closure = self.compile(node)
+    if not needs_location(node): return closure
+
+    def located(context:Context):
+      return located_value(node, closure(context), context)
+    return located
+
+  def compile_IfNode(self, node:IfNode) -> Callable:
+    cases = [(self.compile(condition), self.compile_located(expr)) for condition, expr in node.cases]
+    else_closure = self.compile_located(node.else_case) if node.else_case else None
+
+    def if_expr(context:Context):
+      for condition_closure, expr_closure in cases:
+        if condition_closure(context).is_true():
+          return expr_closure(context)
+
+      if else_closure is not None:
+        return else_closure(context)
+      return None
+    return if_expr
+
+  def compile_ForNode(self, node:ForNode) -> Callable:
+    var_name = node.var_name_token.value
+    start_closure = self.compile(node.start_value_node)
+    end_closure = self.compile(node.end_value_node)
+    step_closure = self.compile(node.step_value_node) if node.step_value_node else None
+    body_closure = self.compile(node.body_node)
+    pos_start, pos_end = node.pos_start, node.pos_end
+    slot = node.slot
+    collect = node.collect
+
+    if node.lazy:
+      def lazy_for_loop(context:Context):
+        start_value = start_closure(context).value
+        end_value = end_closure(context).value
+        step_value = step_closure(context).value if step_closure is not None else 1
+        return lazy_for(self, node, context, loop_range(start_value, end_value, step_value))
+      return lazy_for_loop
+
+    def for_loop(context:Context):
+      elements = []
+      append = elements.append if collect else DISCARD
+      start_value = start_closure(context).value
+      end_value = end_closure(context).value
+      step_value = step_closure(context).value if step_closure is not None else 1
+      symbol_table = context.symbol_table
+
+      if slot is not None:
+        slots = symbol_table.slots
+        for i in loop_range(start_value, end_value, step_value):
+          slots[slot] = Number.make(i)
+          append(body_closure(context))
+      else:
+        for i in loop_range(start_value, end_value, step_value):
+          symbol_table.set(var_name, Number.make(i))
+          append(body_closure(context))
+
+      if not collect: return Number.null()
+      return List(elements).set_context(context).set_position(pos_start, pos_end)
+    return for_loop
+
+  def compile_WhileNode(self, node:WhileNode) -> Callable:
+    condition_closure = self.compile(node.condition_node)
+    body_closure = self.compile(node.body_node)
+    pos_start, pos_end = node.pos_start, node.pos_end
+
+    collect = node.collect
+
+    if node.lazy:
+      def lazy_while_loop(context:Context):
+        return lazy_while(self, node, context)
+      return lazy_while_loop
+
+    def while_loop(context:Context):
+      elements = []
+      append = elements.append if collect else DISCARD
+      while condition_closure(context).is_true():
+        append(body_closure(context))
+      if not collect: return Number.null()
+      return List(elements).set_context(context).set_position(pos_start, pos_end)
+    return while_loop
+
+  def compile_FuncDefNode(self, node:FuncDefNode) -> Callable:
+    func_name = node.var_name_tok.value if node.var_name_tok else None
+    body_node = node.body_node
+    arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+    layout = node.layout
+    pos_start, pos_end = node.pos_start, node.pos_end
+    slot = node.slot
+
+    def func_def(context:Context):
+      func_value = Function(func_name, body_node, arg_names, layout).set_context(context).set_position(pos_start, pos_end)
+      if slot is not None:
+        context.symbol_table.slots[slot] = func_value
+      elif func_name is not None:
+        context.symbol_table.set(func_name, func_value)
+      return func_value
+    return func_def
+
+  def compile_CallNode(self, node:CallNode) -> Callable:
+    callee_closure = self.compile(node.node_to_call)
+    arg_closures = [self.compile(arg_node) for arg_node in node.arg_nodes]
+    pos_start, pos_end = node.pos_start, node.pos_end
+
+    if node.tail:
+      def tail_call(context:Context):
+        value_to_call = callee_closure(context).copy().set_position(pos_start, pos_end).set_context(context)
+        return TailCall(value_to_call, [arg_closure(context) for arg_closure in arg_closures])
+      return tail_call
+
+    def call(context:Context):
+      value_to_call = callee_closure(context).copy().set_position(pos_start, pos_end).set_context(context)
+      args = [arg_closure(context) for arg_closure in arg_closures]
+
+      res = value_to_call.execute(args, self)
+      if res.error: raise ErrorSignal(res.error)
+      return res.value
+    return call
+
+  def compile_ListNode(self, node:ListNode) -> Callable:
+    element_closures = [self.compile(element_node) for element_node in node.element_nodes]
+    pos_start, pos_end = node.pos_start, node.pos_end
+
+    def list_expr(context:Context):
+      elements = [element_closure(context) for element_closure in element_closures]
+      return List(elements).set_context(context).set_position(pos_start, pos_end)
+    return list_expr
+
+  def compile_VoidNode(self, node:VoidNode) -> Callable:
+    operand_closure = self.compile(node.node)
+
+    def void(context:Context):
+      operand_closure(context)
+      return Number.null()
+    return void
+
+  def compile_ConstantNode(self, node:ConstantNode) -> Callable:
+    value = node.value
+
+    def constant(context:Context):
+      return materialize_constant(value, context)
+    return constant
@@ -0,0 +1,81 @@
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from typing import Union
+from .nodes import Node
+
+# Bump whenever nodes, tokens or positions change shape, entries written by other versions are then ignored
+CACHE_VERSION = 8
+
+class CompileCache:
+  def __init__(self, max_entries:int=256, directory:Union[str, None]=None):
+    self.max_entries = max_entries
+    self.directory = directory
+    self.entries = OrderedDict()
+    self.hits = 0
+    self.disk_hits = 0
+    self.misses = 0
+
+  def key(self, fn:str, text:str, options:tuple=()) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_VERSION}\0{fn}\0{options!r}\0".encode("utf-8"))
+    digest.update(text.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+  def get(self, key:str) -> Union[Node, None]:
+    node = self.entries.get(key)
+    if node is not None:
+      self.entries.move_to_end(key)
+      self.hits += 1
+      return node
+
+    node = self.load(key)
+    if node is not None:
+      self.remember(key, node)
+      self.disk_hits += 1
+      return node
+
+    self.misses += 1
+    return None
+
+  def put(self, key:str, node:Node):
+    self.remember(key, node)
+    self.store(key, node)
+
+  def remember(self, key:str, node:Node):
+    self.entries[key] = node
+    self.entries.move_to_end(key)
+    while len(self.entries) > self.max_entries:
+      self.entries.popitem(last=False)
+
+  def clear(self):
+    self.entries.clear()
+
+  def path(self, key:str) -> str:
+    return os.path.join(self.directory, key[:2], f"{key}.ast")
+
+  def load(self, key:str) -> Union[Node, None]:
+    if self.directory is None: return None
+
+    try:
+      with open(self.path(key), "rb") as file:
+        version, node = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError, ImportError, RecursionError):
+      return None
+
+    if version != CACHE_VERSION: return None
+    return node
+
+  def store(self, key:str, node:Node):
+    if self.directory is None: return
+
+    path = self.path(key)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+      os.makedirs(os.path.dirname(path), exist_ok=True)
+      with open(temporary_path, "wb") as file:
+        pickle.dump((CACHE_VERSION, node), file, protocol=pickle.HIGHEST_PROTOCOL)
+      os.replace(temporary_path, path)
+    except (OSError, pickle.PicklingError, RecursionError):
+      if os.path.exists(temporary_path): os.remove(temporary_path)
@@ -0,0 +1,206 @@
+from typing import Union
+from .nodes import Node, BinOpNode, NumberNode, UnaryOpNode, VarAccessNode, VarAssignNode, IfNode, ForNode, WhileNode, FuncDefNode, CallNode, StringNode, ListNode, ConstantNode, VoidNode
+from .location import needs_location
+from .number_val import Number
+from .string_val import String
+from . import tokenClass
+
+OP_LOAD_VAR = 0
+OP_STORE_VAR = 1
+OP_LOAD_NUMBER = 2
+OP_LOAD_STRING = 3
+OP_LOAD_NONE = 4
+OP_BINARY = 5
+OP_NEGATE = 6
+OP_NOT = 7
+OP_LOCATE = 8
+OP_JUMP = 9
+OP_JUMP_IF_FALSE = 10
+OP_FOR_SETUP = 11
+OP_FOR_ITER = 12
+OP_WHILE_SETUP = 13
+OP_LOOP_APPEND = 14
+OP_LOOP_END = 15
+OP_MAKE_FUNCTION = 16
+OP_PREPARE_CALL = 17
+OP_CALL = 18
+OP_BUILD_LIST = 19
+OP_RETURN = 20
+OP_LOAD_CONSTANT = 21
+OP_LOAD_SLOT = 22
+OP_STORE_SLOT = 23
+OP_TAIL_CALL = 24
+OP_POP = 25
+OP_LAZY_FOR = 26
+OP_LAZY_WHILE = 27
+
+OP_NAMES = {value: name for name, value in globals().items() if name.startswith("OP_")}
+
+BINARY_OPERATIONS = {
+  tokenClass.TT_PLUS: "added_to",
+  tokenClass.TT_MINUS: "subbed_by",
+  tokenClass.TT_MUL: "multed_by",
+  tokenClass.TT_DIV: "dived_by",
+  tokenClass.TT_POW: "powed_by",
+  tokenClass.TT_EE: "get_comparison_eq",
+  tokenClass.TT_NE: "get_comparison_ne",
+  tokenClass.TT_LT: "get_comparison_lt",
+  tokenClass.TT_GT: "get_comparison_gt",
+  tokenClass.TT_LTE: "get_comparison_lte",
+  tokenClass.TT_GTE: "get_comparison_gte",
+  (tokenClass.TT_KEYWORD, "AND"): "anded_by",
+  (tokenClass.TT_KEYWORD, "OR"): "ored_by"
+}
+
+def binary_operation_name(op_tok:tokenClass.Token) -> Union[str, None]:
+  if op_tok.type == tokenClass.TT_KEYWORD:
+    return BINARY_OPERATIONS.get((op_tok.type, op_tok.value))
+  return BINARY_OPERATIONS.get(op_tok.type)
+
+class CodeObject:
+  def __init__(self, node:Node):
+    self.node = node
+    self.instructions = []
+
+  def emit(self, op:int, arg=None, node:Union[Node, None]=None) -> int:
+    self.instructions.append((op, arg, node))
+    return len(self.instructions) - 1
+
+  def patch(self, index:int, arg):
+    op, _, node = self.instructions[index]
+    self.instructions[index] = (op, arg, node)
+
+  def current_index(self) -> int:
+    return len(self.instructions)
+
+  def disassemble(self) -> str:
+    lines = []
+    for index, (op, arg, _) in enumerate(self.instructions):
+      lines.append(f"{index:>4} {OP_NAMES[op]:<18} {'' if arg is None else arg}")
+    return "\n".join(lines)
+
+class Compiler:
+  def compile(self, node:Node) -> CodeObject:
+    code = CodeObject(node)
+    self.compile_node(node, code)
+    code.emit(OP_RETURN)
+    return code
+
+  def compile_node(self, node:Node, code:CodeObject):
+    method_name = f"compile_{type(node).__name__}"
+    method = getattr(self, method_name, self.no_compile_method)
+    method(node, code)
+
+  def no_compile_method(self, node:Node, code:CodeObject):
+    raise Exception(f"No compile_{type(node).__name__} method defined")
+
+  def compile_NumberNode(self, node:NumberNode, code:CodeObject):
+    code.emit(OP_LOAD_NUMBER, Number.make(node.tok.value), node)
+
+  def compile_StringNode(self, node:StringNode, code:CodeObject):
+    code.emit(OP_LOAD_STRING, String(node.tok.value), node)
+
+  def compile_VarAccessNode(self, node:VarAccessNode, code:CodeObject):
+    if node.slot is not None:
+      code.emit(OP_LOAD_SLOT, node.slot, node)
+    else:
+      code.emit(OP_LOAD_VAR, node.var_name_tok.value, node)
+
+  def compile_VarAssignNode(self, node:VarAssignNode, code:CodeObject):
+    self.compile_node(node.value_node, code)
+    if node.slot is not None:
+      code.emit(OP_STORE_SLOT, node.slot, node)
+    else:
+      code.emit(OP_STORE_VAR, node.var_name_tok.value, node)
+
+  def compile_BinOpNode(self, node:BinOpNode, code:CodeObject):
+    self.compile_node(node.left_node, code)
+    self.compile_node(node.right_node, code)
+    code.emit(OP_BINARY, binary_operation_name(node.op_tok), node)
+
+  def compile_UnaryOpNode(self, node:UnaryOpNode, code:CodeObject):
+    self.compile_node(node.node, code)
+
+    if node.op_tok.type == tokenClass.TT_MINUS:
+      code.emit(OP_NEGATE, None, node)
+    elif node.op_tok.matches(tokenClass.TT_KEYWORD, "NOT"):
+      code.emit(OP_NOT, None, node)
+
+  def compile_IfNode(self, node:IfNode, code:CodeObject):
+    end_jumps = []
+
+    for condition, expr in node.cases:
+      self.compile_node(condition, code)
+      next_case_jump = code.emit(OP_JUMP_IF_FALSE, None, condition)
+      self.compile_node(expr, code)
+      if needs_location(expr): code.emit(OP_LOCATE, None, expr)
+      end_jumps.append(code.emit(OP_JUMP))
+      code.patch(next_case_jump, code.current_index())
+
+    if node.else_case:
+      self.compile_node(node.else_case, code)
+      if needs_location(node.else_case): code.emit(OP_LOCATE, None, node.else_case)
+    else:
+      code.emit(OP_LOAD_NONE)
+
+    for jump in end_jumps:
+      code.patch(jump, code.current_index())
+
+  def compile_ForNode(self, node:ForNode, code:CodeObject):
+    self.compile_node(node.start_value_node, code)
+    self.compile_node(node.end_value_node, code)
+    if node.step_value_node:
+      self.compile_node(node.step_value_node, code)
+    else:
+      code.emit(OP_LOAD_NONE)
+
+    if node.lazy:
+      code.emit(OP_LAZY_FOR, None, node)
+      return
+
+    code.emit(OP_FOR_SETUP, None, node)
+    loop_start = code.emit(OP_FOR_ITER, None, node)
+    self.compile_node(node.body_node, code)
+    code.emit(OP_LOOP_APPEND if node.collect else OP_POP)
+    code.emit(OP_JUMP, loop_start)
+    code.patch(loop_start, code.emit(OP_LOOP_END, None, node))
+
+  def compile_WhileNode(self, node:WhileNode, code:CodeObject):
+    if node.lazy:
+      code.emit(OP_LAZY_WHILE, None, node)
+      return
+
+    code.emit(OP_WHILE_SETUP, None, node)
+    loop_start = code.current_index()
+    self.compile_node(node.condition_node, code)
+    exit_jump = code.emit(OP_JUMP_IF_FALSE, None, node.condition_node)
+    self.compile_node(node.body_node, code)
+    code.emit(OP_LOOP_APPEND if node.collect else OP_POP)
+    code.emit(OP_JUMP, loop_start)
+    code.patch(exit_jump, code.emit(OP_LOOP_END, None, node))
+
+  def compile_FuncDefNode(self, node:FuncDefNode, code:CodeObject):
+    code.emit(OP_MAKE_FUNCTION, None, node)
+
+  def compile_CallNode(self, node:CallNode, code:CodeObject):
+    self.compile_node(node.node_to_call, code)
+    code.emit(OP_PREPARE_CALL, None, node)
+
+    for arg_node in node.arg_nodes:
+      self.compile_node(arg_node, code)
+
+    code.emit(OP_TAIL_CALL if node.tail else OP_CALL, len(node.arg_nodes), node)
+
+  def compile_ListNode(self, node:ListNode, code:CodeObject):
+    for element_node in node.element_nodes:
+      self.compile_node(element_node, code)
+
+    code.emit(OP_BUILD_LIST, len(node.element_nodes), node)
+
+  def compile_ConstantNode(self, node:ConstantNode, code:CodeObject):
+    code.emit(OP_LOAD_CONSTANT, node.value, node)
+
+  def compile_VoidNode(self, node:VoidNode, code:CodeObject):
+    self.compile_node(node.node, code)
+    code.emit(OP_POP)
+    code.emit(OP_LOAD_NUMBER, Number.null(), node)
@@ -1,31 +1,108 @@
 from typing import Union
 from .basic.runtime_result import RTResult
 from .basic.base_function import BaseFunction
+from .basic.context import Context
+from .basic.symbol_table import FrameSymbolTable
+from .basic.tail_call import TailCall
 from .nodes import Node
+from .lazy_list_val import LazySource
+from .location import located_value
 
 class Function(BaseFunction):
-  def __init__(self, name:Union[str, None], body_node:Node, arg_names:list):
+  __slots__ = ("body_node", "arg_names", "layout")
+
+  def __init__(self, name:Union[str, None], body_node:Node, arg_names:list, layout:Union[dict, None]=None):
     super(Function, self).__init__(name)
     self.body_node = body_node
     self.arg_names = arg_names
+    self.layout = layout
+
+  def generate_new_context(self) -> Context:
+    if self.layout is None: return super(Function, self).generate_new_context()
+
+    new_context = Context(self.name, self.context, self.pos_start)
+    new_context.symbol_table = FrameSymbolTable(self.layout, new_context.parent.symbol_table)
+    return new_context
 
   def execute(self, args:list, interpreter):
     res = RTResult()
-
     exec_ctx = self.generate_new_context()
 
     res.register(self.check_and_populate_args(self.arg_names, args, exec_ctx))
     if res.error: return res
 
-    value = res.register(interpreter.visit(self.body_node, exec_ctx))
-    if res.error: return res
+    return self.run_body(exec_ctx, interpreter)
+
+  # Runs the body in exec_ctx, which already holds the arguments, then the calls it made in tail position
+  def run_body(self, exec_ctx:Context, interpreter):
+    res = RTResult()
+    function = self
+    location = None
+    hooks = interpreter.hooks
+
+    while True:
+      if hooks is None:
+        value = res.register(interpreter.visit(function.body_node, exec_ctx))
+      else:
+        value = res.register(hooks.traced_call(function, exec_ctx, lambda: interpreter.visit(function.body_node, exec_ctx)))
+      if res.error: return res
+      if not isinstance(value, TailCall): break
+
+      # The outermost location wins, it is the last one a nested evaluation would have applied
+      if location is None: location = value.location
+      function, args = value.function, value.args
+      if not isinstance(function, Function):
+        value = res.register(function.execute(args, interpreter))
+        if res.error: return res
+        break
+
+      exec_ctx = function.generate_new_context()
+      res.register(function.check_and_populate_args(function.arg_names, args, exec_ctx))
+      if res.error: return res
+
+    if location is not None: value = located_value(location[0], value, location[1])
     return res.success(value)
 
   def copy(self):
-    copy = Function(self.name, self.body_node, self.arg_names)
+    copy = Function(self.name, self.body_node, self.arg_names, self.layout)
     copy.set_context(self.context)
     copy.set_position(self.pos_start, self.pos_end)
     return copy
 
   def __repr__(self):
-    return f"<function {self.name}>"
\ No newline at end of file
+    return f"<function {self.name}>"
+
+# Calls one function over and over for builtins like MAP. A script function runs every call in the
+# same context, its slots refilled in between instead of the context being rebuilt, unless a lazy list
+# created during a call may still read from it.
+class RepeatedCall:
+  __slots__ = ("function", "interpreter", "context", "arg_slots")
+
+  def __init__(self, function:BaseFunction, interpreter):
+    self.function = function
+    self.interpreter = interpreter
+    self.context:Union[Context, None] = None
+    self.arg_slots:Union[list, None] = None
+    if isinstance(function, Function) and function.layout is not None:
+      self.arg_slots = [function.layout[arg_name] for arg_name in function.arg_names]
+
+  def call(self, args:list) -> RTResult:
+    function = self.function
+    exec_ctx = self.context
+    if exec_ctx is None or len(args) != len(self.arg_slots):
+      if self.arg_slots is None: return function.execute(args, self.interpreter)
+
+      exec_ctx = function.generate_new_context()
+      res = function.check_and_populate_args(function.arg_names, args, exec_ctx)
+      if res.error: return res
+    else:
+      slots = [None] * len(exec_ctx.symbol_table.slots)
+      for slot, arg in zip(self.arg_slots, args):
+        slots[slot] = arg
+      exec_ctx.symbol_table.slots = slots
+      if exec_ctx.symbol_table.symbols: exec_ctx.symbol_table.symbols.clear()
+
+    lazy_sources = LazySource.created
+    res = function.run_body(exec_ctx, self.interpreter)
+    self.context = exec_ctx if not res.error and LazySource.created == lazy_sources else None
+    return res
@@ -0,0 +1,65 @@
+from time import perf_counter
+from typing import Callable
+from .basic.context import Context
+from .basic.runtime_result import RTResult
+from .basic.tail_call import TailCall
+from .nodes import Node
+
+# Callbacks of an embedding application, given to an Interpreter as its hooks. Calls check for hooks
+# once and loops once before their first iteration, so without hooks nothing else runs.
+#   on_call(context, position, function)
+#   on_return(context, position, function, value, seconds), value is None when the function ended with a tail call
+#   on_error(context, position, function, error, seconds)
+#   on_loop_iteration(context, position, index, seconds)
+class Hooks:
+  EVENTS = ("on_call", "on_return", "on_error", "on_loop_iteration")
+
+  def __init__(self):
+    self.on_call = []
+    self.on_return = []
+    self.on_error = []
+    self.on_loop_iteration = []
+
+  def register(self, event:str, callback:Callable) -> Callable:
+    if event not in Hooks.EVENTS: raise ValueError(f"Unknown hook event '{event}'")
+    getattr(self, event).append(callback)
+    return callback
+
+  def unregister(self, event:str, callback:Callable):
+    if event not in Hooks.EVENTS: raise ValueError(f"Unknown hook event '{event}'")
+    getattr(self, event).remove(callback)
+
+  # Runs one activation of function in exec_ctx, the position is the one of the call
+  def traced_call(self, function, exec_ctx:Context, run:Callable[[], RTResult]) -> RTResult:
+    position = exec_ctx.parent_entry_pos
+    for callback in self.on_call:
+      callback(exec_ctx, position, function)
+
+    start = perf_counter()
+    res = run()
+    seconds = perf_counter() - start
+
+    if res.error:
+      for callback in self.on_error:
+        callback(exec_ctx, res.error.pos_start, function, res.error, seconds)
+    else:
+      value = None if isinstance(res.value, TailCall) else res.value
+      for callback in self.on_return:
+        callback(exec_ctx, position, function, value, seconds)
+    return res
+
+  # Visitor for the body of one loop, plain visit when nobody listens for iterations
+  def loop_visitor(self, visit:Callable, loop_node:Node) -> Callable:
+    if not self.on_loop_iteration: return visit
+
+    index = 0
+    def visit_iteration(node:Node, context:Context) -> RTResult:
+      nonlocal index
+      start = perf_counter()
+      res = visit(node, context)
+      seconds = perf_counter() - start
+      for callback in self.on_loop_iteration:
+        callback(context, loop_node.pos_start, index, seconds)
+      index += 1
+      return res
+    return visit_iteration
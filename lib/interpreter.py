@@ -1,16 +1,25 @@
 from typing import Union
 from .basic.error import ErrorBase, RTError
-from .nodes import Node, BinOpNode, NumberNode, UnaryOpNode, VarAccessNode, VarAssignNode, IfNode, ForNode, WhileNode, FuncDefNode, CallNode, StringNode, ListNode
+from .nodes import Node, BinOpNode, NumberNode, UnaryOpNode, VarAccessNode, VarAssignNode, IfNode, ForNode, WhileNode, FuncDefNode, CallNode, StringNode, ListNode, ConstantNode, VoidNode
 from .basic.context import Context
 from .basic.runtime_result import RTResult
 from . import tokenClass
 from .basic.value import Value
+from .basic.tail_call import TailCall
 from .function_val import Function
-from .number_val import Number
+from .number_val import Number, loop_range
 from .string_val import String
 from .list_val import List
+from .lazy_list_val import lazy_for, lazy_while
+from .optimizer import materialize_constant
+from .location import needs_location, located_value
+from .hooks import Hooks
+from .basic.budget import list_length_limit, list_length_error
 
 class Interpreter:
+  # Set by an embedding application, see Hooks
+  hooks:Union[Hooks, None] = None
+
   def visit(self, node:Node, context:Context):
     method_name = f"visit_{type(node).__name__}"
     method = getattr(self, method_name, self.no_visit_method)
@@ -23,12 +32,13 @@ class Interpreter:
     res = RTResult()
 
     var_name = node.var_name_tok.value
-    value = context.symbol_table.get(var_name)
+    value = context.symbol_table.slots[node.slot] if node.slot is not None else None
+    if value is None:
+      value = context.symbol_table.get(var_name)
 
     if not value:
       return res.failure(RTError(node.pos_start, node.pos_end, f"'{var_name}' is not defined", context))
 
-    value = value.copy().set_position(node.pos_start, node.pos_end).set_context(context)
     return res.success(value)
 
   def visit_VarAssignNode(self, node:VarAssignNode, context:Context) -> RTResult:
@@ -38,12 +48,14 @@ class Interpreter:
     value = res.register(self.visit(node.value_node, context))
     if res.error: return res
 
-    if not context.symbol_table.set(var_name, value):
+    if node.slot is not None:
+      context.symbol_table.slots[node.slot] = value
+    elif not context.symbol_table.set(var_name, value):
       return res.failure(RTError(node.var_name_tok.pos_start, node.var_name_tok.pos_end, "Invalid identifier - Protected variable", context))
     return res.success(value)
 
   def visit_NumberNode(self, node:NumberNode, context:Context) -> RTResult:
-    return RTResult().success(Number(node.tok.value).set_context(context).set_position(node.pos_start, node.pos_end))
+    return RTResult().success(Number.make(node.tok.value))
 
   def visit_BinOpNode(self, node:BinOpNode, context:Context) -> RTResult:
     res = RTResult()
@@ -53,38 +65,46 @@ class Interpreter:
     right:Number = res.register(self.visit(node.right_node, context))
     if res.error: return res
 
+    result, error = self.operate(node.op_tok, left, right)
+    if error:
+      left = located_value(node.left_node, left, context)
+      right = located_value(node.right_node, right, context)
+      _, error = self.operate(node.op_tok, left, right)
+      return res.failure(error)
+    return res.success(result)
+
+  def operate(self, op_tok:tokenClass.Token, left:Value, right:Value) -> tuple:
     result = Number(0)
     error:Union[None, ErrorBase] = None
 
-    if node.op_tok.type == tokenClass.TT_PLUS:
+    if op_tok.type == tokenClass.TT_PLUS:
       result, error = left.added_to(right)
-    elif node.op_tok.type == tokenClass.TT_MINUS:
+    elif op_tok.type == tokenClass.TT_MINUS:
       result, error = left.subbed_by(right)
-    elif node.op_tok.type == tokenClass.TT_MUL:
+    elif op_tok.type == tokenClass.TT_MUL:
       result, error = left.multed_by(right)
-    elif node.op_tok.type == tokenClass.TT_DIV:
+    elif op_tok.type == tokenClass.TT_DIV:
       result, error = left.dived_by(right)
-    elif node.op_tok.type == tokenClass.TT_POW:
+    elif op_tok.type == tokenClass.TT_POW:
       result, error = left.powed_by(right)
-    elif node.op_tok.type == tokenClass.TT_EE:
+    elif op_tok.type == tokenClass.TT_EE:
       result, error = left.get_comparison_eq(right)
-    elif node.op_tok.type == tokenClass.TT_NE:
+    elif op_tok.type == tokenClass.TT_NE:
       result, error = left.get_comparison_ne(right)
-    elif node.op_tok.type == tokenClass.TT_LT:
+    elif op_tok.type == tokenClass.TT_LT:
       result, error = left.get_comparison_lt(right)
-    elif node.op_tok.type == tokenClass.TT_GT:
+    elif op_tok.type == tokenClass.TT_GT:
       result, error = left.get_comparison_gt(right)
-    elif node.op_tok.type == tokenClass.TT_LTE:
+    elif op_tok.type == tokenClass.TT_LTE:
       result, error = left.get_comparison_lte(right)
-    elif node.op_tok.type == tokenClass.TT_GTE:
+    elif op_tok.type == tokenClass.TT_GTE:
       result, error = left.get_comparison_gte(right)
-    elif node.op_tok.matches(tokenClass.TT_KEYWORD, 'AND'):
+    elif op_tok.matches(tokenClass.TT_KEYWORD, 'AND'):
       result, error = left.anded_by(right)
-    elif node.op_tok.matches(tokenClass.TT_KEYWORD, 'OR'):
+    elif op_tok.matches(tokenClass.TT_KEYWORD, 'OR'):
       result, error = left.ored_by(right)
 
-    if error: return res.failure(error)
-    return res.success(result.set_position(node.pos_start, node.pos_end))
+    return result, error
 
   def visit_UnaryOpNode(self, node:UnaryOpNode, context:Context) -> RTResult:
     res = RTResult()
@@ -92,14 +112,20 @@ class Interpreter:
     number = res.register(self.visit(node.node, context))
     if res.error: return res
 
+    result, error = self.operate_unary(node.op_tok, number)
+    if error:
+      _, error = self.operate_unary(node.op_tok, located_value(node.node, number, context))
+      return res.failure(error)
+    return res.success(result)
+
+  def operate_unary(self, op_tok:tokenClass.Token, number:Value) -> tuple:
     error: Union[None, ErrorBase] = None
-    if node.op_tok.type == tokenClass.TT_MINUS:
-      number, error = number.multed_by(Number(-1))
-    elif node.op_tok.matches(tokenClass.TT_KEYWORD, "NOT"):
+    if op_tok.type == tokenClass.TT_MINUS:
+      number, error = number.multed_by(Number.make(-1))
+    elif op_tok.matches(tokenClass.TT_KEYWORD, "NOT"):
       number, error = number.notted()
 
-    if error: return res.failure(error)
-    return res.success(number.set_position(node.pos_start, node.pos_end))
+    return number, error
 
   def visit_IfNode(self, node:IfNode, context:Context) -> RTResult:
     res = RTResult()
@@ -111,15 +137,21 @@ class Interpreter:
       if condition_value.is_true():
         expr_value = res.register(self.visit(expr, context))
         if res.error: return res
+        if needs_location(expr): expr_value = located_value(expr, expr_value, context)
         return res.success(expr_value)
 
     if node.else_case:
       else_value = res.register(self.visit(node.else_case, context))
       if res.error: return res
+      if needs_location(node.else_case): else_value = located_value(node.else_case, else_value, context)
       return res.success(else_value)
 
     return res.success(None)
 
+  # Visitor for the body of one loop, chosen once before the first iteration
+  def loop_visitor(self, node:Union[ForNode, WhileNode]):
+    return self.visit if self.hooks is None else self.hooks.loop_visitor(self.visit, node)
+
   def visit_ForNode(self, node:ForNode, context:Context) -> RTResult:
     res = RTResult()
     elements = []
@@ -134,37 +166,52 @@ class Interpreter:
       step_value:Number = res.register(self.visit(node.step_value_node, context))
       if res.error: return res
     else:
-      step_value:Number = Number(1)
+      step_value:Number = Number.make(1)
 
-    i = start_value.value
-    if step_value.value >= 0:
-      condition = lambda: i < end_value.value
-    else:
-      condition = lambda: i > end_value.value
+    if node.lazy: return res.success(lazy_for(self, node, context, loop_range(start_value.value, end_value.value, step_value.value)))
+
+    symbol_table = context.symbol_table
+    visit_body = self.loop_visitor(node)
+    max_length = list_length_limit() if node.collect else None
+    for i in loop_range(start_value.value, end_value.value, step_value.value):
+      if node.slot is not None:
+        symbol_table.slots[node.slot] = Number.make(i)
+      else:
+        symbol_table.set(node.var_name_token.value, Number.make(i))
 
-    while condition():
-      context.symbol_table.set(node.var_name_token.value, Number(i))
-      i += step_value.value
-      
-      elements.append(res.register(self.visit(node.body_node, context)))
+      value = res.register(visit_body(node.body_node, context))
       if res.error: return res
+      if node.collect:
+        elements.append(value)
+        if max_length is not None and len(elements) > max_length:
+          return res.failure(list_length_error(len(elements), node.pos_start, node.pos_end, context))
 
+    if not node.collect: return res.success(Number.null())
     return res.success(List(elements).set_context(context).set_position(node.pos_start, node.pos_end))
 
   def visit_WhileNode(self, node:WhileNode, context:Context) -> RTResult:
     res = RTResult()
     elements = []
 
+    if node.lazy: return res.success(lazy_while(self, node, context))
+
     condition:Value = res.register(self.visit(node.condition_node, context))
     if res.error: return res
 
+    visit_body = self.loop_visitor(node)
+    max_length = list_length_limit() if node.collect else None
     while condition.is_true():
-      elements.append(res.register(self.visit(node.body_node, context)))
+      value = res.register(visit_body(node.body_node, context))
       if res.error: return res
+      if node.collect:
+        elements.append(value)
+        if max_length is not None and len(elements) > max_length:
+          return res.failure(list_length_error(len(elements), node.pos_start, node.pos_end, context))
 
       condition:Value = res.register(self.visit(node.condition_node, context))
       if res.error: return res
 
+    if not node.collect: return res.success(Number.null())
     return res.success(List(elements).set_context(context).set_position(node.pos_start, node.pos_end))
 
   def visit_FuncDefNode(self, node:FuncDefNode, context:Context) -> RTResult:
@@ -173,9 +220,11 @@ class Interpreter:
     func_name = node.var_name_tok.value if node.var_name_tok else None
     body_node = node.body_node
     arg_names = [arg_name.value for arg_name in node.arg_name_toks]
-    func_value = Function(func_name, body_node, arg_names).set_context(context).set_position(node.pos_start, node.pos_end)
+    func_value = Function(func_name, body_node, arg_names, node.layout).set_context(context).set_position(node.pos_start, node.pos_end)
 
-    if node.var_name_tok:
+    if node.slot is not None:
+      context.symbol_table.slots[node.slot] = func_value
+    elif node.var_name_tok:
       context.symbol_table.set(func_name, func_value)
 
     return res.success(func_value)
@@ -187,20 +236,21 @@ class Interpreter:
     value_to_call = res.register(self.visit(node.node_to_call, context))
     if res.error: return res
 
-    value_to_call:Function = value_to_call.copy().set_position(node.pos_start, node.pos_end)
+    value_to_call:Function = value_to_call.copy().set_position(node.pos_start, node.pos_end).set_context(context)
 
     for arg_node in node.arg_nodes:
       args.append(res.register(self.visit(arg_node, context)))
       if res.error: return res
 
+    if node.tail: return res.success(TailCall(value_to_call, args))
+
     return_val = res.register(value_to_call.execute(args, self))
     if res.error: return res
 
-    return_val = return_val.copy().set_position(node.pos_start, node.pos_end).set_context(context)
     return res.success(return_val)
 
   def visit_StringNode(self, node:StringNode, context:Context) -> RTResult:
-    return RTResult().success(String(node.tok.value).set_position(node.pos_start, node.pos_end).set_context(context))
+    return RTResult().success(String(node.tok.value))
 
   def visit_ListNode(self, node:ListNode, context:Context) -> RTResult:
     res = RTResult()
@@ -210,4 +260,15 @@ class Interpreter:
       elements.append(res.register(self.visit(element_node, context)))
       if res.error: return res
 
-    return res.success(List(elements).set_context(context).set_position(node.pos_start, node.pos_end))
\ No newline at end of file
+    return res.success(List(elements).set_context(context).set_position(node.pos_start, node.pos_end))
+
+  def visit_VoidNode(self, node:VoidNode, context:Context) -> RTResult:
+    res = RTResult()
+
+    res.register(self.visit(node.node, context))
+    if res.error: return res
+
+    return res.success(Number.null())
+
+  def visit_ConstantNode(self, node:ConstantNode, context:Context) -> RTResult:
+    return RTResult().success(materialize_constant(node.value, context))
@@ -0,0 +1,113 @@
+from typing import Union, Iterator
+from .basic.error import RTError, ErrorBase
+from .basic.context import Context
+from .basic.persistent_vector import PVector, EMPTY
+from .basic.budget import forcing_interpreter, list_length_limit, list_length_error
+from .nodes import Node, ForNode, WhileNode
+from .number_val import Number
+from .list_val import List, ListStore
+
+# Results of a LAZY loop, produced when first needed and then kept. Copies of a LazyList share
+# one source, the same way copies of a List share their store.
+class LazySource(ListStore):
+  __slots__ = ("producer", "error", "node", "context")
+
+  # Counts every source made, a context can only be referenced by a lazy list made while it was in use
+  created = 0
+
+  def __init__(self, producer:Iterator, node:Node, context:Context):
+    super(LazySource, self).__init__(EMPTY)
+    LazySource.created += 1
+    self.producer:Union[Iterator, None] = producer
+    self.error:Union[ErrorBase, None] = None
+    # The loop, for errors of budgets
+    self.node = node
+    self.context = context
+
+  def force(self, count:Union[int, None]=None) -> Union[ErrorBase, None]:
+    max_length = list_length_limit()
+    while self.producer is not None and (count is None or len(self.vector) < count):
+      res = next(self.producer, None)
+      if res is None:
+        self.producer = None
+      elif res.error:
+        self.error = res.error
+        self.producer = None
+      else:
+        self.vector = self.vector.append(res.value)
+        # Not kept as the error of the list, a later run may produce it under another budget
+        if max_length is not None and len(self.vector) > max_length:
+          return list_length_error(len(self.vector), self.node.pos_start, self.node.pos_end, self.context)
+    return self.error
+
+class LazyList(List):
+  __slots__ = ()
+
+  @property
+  def elements(self) -> PVector:
+    self.store.force()
+    return self.store.vector
+
+  @elements.setter
+  def elements(self, elements:PVector):
+    self.store.vector = elements
+    self.store.numbers = None
+
+  def materialize(self) -> Union[ErrorBase, None]:
+    return self.store.force()
+
+  def dived_by(self, other):
+    if isinstance(other, Number):
+      index = other.value
+      if isinstance(index, int) and index >= 0:
+        error = self.store.force(index + 1)
+      else:
+        error = self.store.force()
+        if error: return None, error
+
+      try:
+        return self.store.vector[index], None
+      except (IndexError, TypeError):
+        if error: return None, error
+        return None, RTError(other.pos_start, other.pos_end, "Index to the list is out of bounds")
+    else:
+      return None, self.illegal_operation(other)
+
+  # Shows what was produced so far, displaying must not run a (possibly endless) producer. PRINT
+  # produces everything first and fails with the error instead.
+  def __repr__(self):
+    return "[" + ", ".join([repr(element) for element in self.store.vector] + self.pending()) + "]"
+
+  def __str__(self):
+    return ", ".join([str(element) for element in self.store.vector] + self.pending())
+
+  def pending(self) -> list:
+    if self.store.error is not None: return [f"<{self.store.error.error_name}: {self.store.error.details}>"]
+    if self.store.producer is not None: return ["..."]
+    return []
+
+  def copy(self):
+    return LazyList(self.store).set_context(self.context).set_position(self.pos_start, self.pos_end)
+
+def lazy_for(interpreter, node:ForNode, context:Context, values:Iterator) -> LazyList:
+  def results():
+    for i in values:
+      if node.slot is not None:
+        context.symbol_table.slots[node.slot] = Number.make(i)
+      else:
+        context.symbol_table.set(node.var_name_token.value, Number.make(i))
+      yield forcing_interpreter(interpreter).visit(node.body_node, context)
+
+  return LazyList(LazySource(results(), node, context)).set_context(context).set_position(node.pos_start, node.pos_end)
+
+def lazy_while(interpreter, node:WhileNode, context:Context) -> LazyList:
+  def results():
+    while True:
+      visit = forcing_interpreter(interpreter).visit
+      res = visit(node.condition_node, context)
+      if res.error or not res.value.is_true():
+        if res.error: yield res
+        return
+      yield visit(node.body_node, context)
+
+  return LazyList(LazySource(results(), node, context)).set_context(context).set_position(node.pos_start, node.pos_end)
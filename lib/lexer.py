@@ -1,19 +1,24 @@
 from typing import Union
 from .basic.error import IllegalCharError, ExpectedCharacterError, ErrorBase
-from .basic.position import Position
+from .basic.position import Position, Source
 from . import tokenClass
 
 class Lexer:
   def __init__(self, fn, text):
     self.fn = fn
     self.text = text
-    self.pos = Position(-1, 0, -1, fn, text)
+    self.source = Source(fn, text)
+    self.idx = -1
     self.current_char = None
     self.advance()
 
   def advance(self):
-    self.pos.advance(self.current_char)
-    self.current_char = self.text[self.pos.idx] if self.pos.idx < len(self.text) else None
+    self.idx += 1
+    self.current_char = self.text[self.idx] if self.idx < len(self.text) else None
+
+  def make_token(self, type_, value=None, start:Union[int, None]=None):
+    if start is None: return tokenClass.Token.from_offsets(type_, value, self.source, self.idx, self.idx + 1)
+    return tokenClass.Token.from_offsets(type_, value, self.source, start, self.idx)
 
   def make_tokens(self)->(list, Union[ErrorBase, None]):
     tokens = []
@@ -28,30 +33,30 @@ class Lexer:
       elif self.current_char == "\"":
         tokens.append(self.make_string())
       elif self.current_char == '+':
-        tokens.append(tokenClass.Token(tokenClass.TT_PLUS, pos_start=self.pos))
+        tokens.append(self.make_token(tokenClass.TT_PLUS))
         self.advance()
       elif self.current_char == '-':
         tokens.append(self.make_minus_or_arrow())
       elif self.current_char == '*':
-        tokens.append(tokenClass.Token(tokenClass.TT_MUL, pos_start=self.pos))
+        tokens.append(self.make_token(tokenClass.TT_MUL))
         self.advance()
       elif self.current_char == '/':
-        tokens.append(tokenClass.Token(tokenClass.TT_DIV, pos_start=self.pos))
+        tokens.append(self.make_token(tokenClass.TT_DIV))
         self.advance()
       elif self.current_char == '^':
-        tokens.append(tokenClass.Token(tokenClass.TT_POW, pos_start=self.pos))
+        tokens.append(self.make_token(tokenClass.TT_POW))
         self.advance()
       elif self.current_char == '(':
-        tokens.append(tokenClass.Token(tokenClass.TT_LPAREN, pos_start=self.pos))
+        tokens.append(self.make_token(tokenClass.TT_LPAREN))
         self.advance()
       elif self.current_char == ')':
-        tokens.append(tokenClass.Token(tokenClass.TT_RPAREN, pos_start=self.pos))
+        tokens.append(self.make_token(tokenClass.TT_RPAREN))
         self.advance()
       elif self.current_char == '[':
-        tokens.append(tokenClass.Token(tokenClass.TT_LSBRAC, pos_start=self.pos))
+        tokens.append(self.make_token(tokenClass.TT_LSBRAC))
         self.advance()
       elif self.current_char == ']':
-        tokens.append(tokenClass.Token(tokenClass.TT_RSBRAC, pos_start=self.pos))
+        tokens.append(self.make_token(tokenClass.TT_RSBRAC))
         self.advance()
       elif self.current_char == '=':
         tokens.append(self.make_equals())
@@ -64,24 +69,24 @@ class Lexer:
       elif self.current_char == '>':
         tokens.append(self.make_greater_than())
       elif self.current_char == ":": # Equal to THEN or DO
-        tokens.append(tokenClass.Token(tokenClass.TT_KEYWORD, ":", self.pos))
+        tokens.append(self.make_token(tokenClass.TT_KEYWORD, ":"))
         self.advance()
       elif self.current_char == ',':
-        tokens.append(tokenClass.Token(tokenClass.TT_COMMA, pos_start=self.pos))
+        tokens.append(self.make_token(tokenClass.TT_COMMA))
         self.advance()
       else:
-        pos_start = self.pos.copy()
+        pos_start = self.idx
         char = self.current_char
         self.advance()
-        return [], IllegalCharError(pos_start, self.pos, "'" + char + "'")
+        return [], IllegalCharError(Position(pos_start, self.source), Position(self.idx, self.source), "'" + char + "'")
 
-    tokens.append(tokenClass.Token(tokenClass.TT_EOF, pos_start=self.pos))
+    tokens.append(self.make_token(tokenClass.TT_EOF))
     return tokens, None
 
   def make_number(self):
     num_str = ''
     dot_count = 0
-    pos_start = self.pos.copy()
+    pos_start = self.idx
 
     while self.current_char is not None and self.current_char in tokenClass.DIGITS + '.':
       if self.current_char == '.':
@@ -93,79 +98,79 @@ class Lexer:
       self.advance()
 
     if dot_count == 0:
-      return tokenClass.Token(tokenClass.TT_INT, int(num_str), pos_start, self.pos)
+      return self.make_token(tokenClass.TT_INT, int(num_str), pos_start)
     else:
-      return tokenClass.Token(tokenClass.TT_FLOAT, float(num_str), pos_start, self.pos)
+      return self.make_token(tokenClass.TT_FLOAT, float(num_str), pos_start)
 
   def make_identifier(self):
     id_string = ""
-    pos_start = self.pos.copy()
+    pos_start = self.idx
 
     while self.current_char is not None and self.current_char in tokenClass.LATTERS_EXTENDED_DIGITS:
       id_string += self.current_char
       self.advance()
 
     tok_type = tokenClass.TT_KEYWORD if id_string in tokenClass.KEYWORDS else tokenClass.TT_IDENTIFIER
-    return tokenClass.Token(tok_type, id_string, pos_start, self.pos)
+    return self.make_token(tok_type, id_string, pos_start)
 
   def make_not_equals(self):
-    pos_start = self.pos.copy()
+    pos_start = self.idx
     self.advance()
 
     if self.current_char == "=":
       self.advance()
-      return tokenClass.Token(tokenClass.TT_NE, pos_start=pos_start, pos_end=self.pos), None
+      return self.make_token(tokenClass.TT_NE, start=pos_start), None
 
     self.advance()
-    return None, ExpectedCharacterError(pos_start, self.pos, "'=' (after '!')")
+    return None, ExpectedCharacterError(Position(pos_start, self.source), Position(self.idx, self.source), "'=' (after '!')")
 
   def make_equals(self):
     token_type = tokenClass.TT_EQ
-    pos_start = self.pos.copy()
+    pos_start = self.idx
     self.advance()
 
     if self.current_char == "=":
       self.advance()
       token_type = tokenClass.TT_EE
 
-    return tokenClass.Token(token_type, pos_start=pos_start, pos_end=self.pos)
+    return self.make_token(token_type, start=pos_start)
 
   def make_less_than(self):
     token_type = tokenClass.TT_LT
-    pos_start = self.pos.copy()
+    pos_start = self.idx
     self.advance()
 
     if self.current_char == "=":
       self.advance()
       token_type = tokenClass.TT_LTE
 
-    return tokenClass.Token(token_type, pos_start=pos_start, pos_end=self.pos)
+    return self.make_token(token_type, start=pos_start)
 
   def make_greater_than(self):
     token_type = tokenClass.TT_GT
-    pos_start = self.pos.copy()
+    pos_start = self.idx
     self.advance()
 
     if self.current_char == "=":
       self.advance()
       token_type = tokenClass.TT_GTE
 
-    return tokenClass.Token(token_type, pos_start=pos_start, pos_end=self.pos)
+    return self.make_token(token_type, start=pos_start)
 
   def make_minus_or_arrow(self):
     tok_type = tokenClass.TT_MINUS
-    pos_start = self.pos.copy()
+    pos_start = self.idx
 
     self.advance()
     if self.current_char == ">":
       self.advance()
       tok_type = tokenClass.TT_ARROW
 
-    return tokenClass.Token(tok_type, pos_start=pos_start, pos_end=self.pos)
+    return self.make_token(tok_type, start=pos_start)
 
   def make_string(self):
     string = ""
-    pos_start = self.pos.copy()
+    pos_start = self.idx
     escape_character = False
 
     self.advance()
@@ -183,4 +188,4 @@ class Lexer:
       escape_character = False
 
     self.advance()
-    return tokenClass.Token(tokenClass.TT_STRING, string, pos_start, self.pos)
\ No newline at end of file
+    return self.make_token(tokenClass.TT_STRING, string, pos_start)
\ No newline at end of file
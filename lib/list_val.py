@@ -1,60 +1,141 @@
+from typing import Union, Iterable
 from .basic.error import RTError
 from .basic.value import Value
+from .basic.persistent_vector import PVector
+from .basic.budget import list_length_error
 from .number_val import Number
+from .vectorized import box, unbox, item
+
+# Elements of a list, shared by every copy of it so APPEND, POP and EXTEND are seen through all of
+# them. The vector itself never changes, operators build their results from it without copying.
+# numbers holds the elements unboxed once VECOP needed them, results of VECOP only get a vector
+# when their elements are asked for.
+class ListStore:
+  __slots__ = ("vector", "numbers")
+
+  def __init__(self, vector:Union[PVector, None], numbers=None):
+    self.vector = vector
+    self.numbers = numbers
 
 class List(Value):
-  def __init__(self, elements:list):
+  __slots__ = ("store",)
+
+  def __init__(self, elements:Union[Iterable, ListStore]):
     super(List, self).__init__()
-    self.elements = elements
+    if isinstance(elements, ListStore):
+      self.store = elements
+    else:
+      self.store = ListStore(elements if isinstance(elements, PVector) else PVector.from_iterable(elements))
+
+  @property
+  def elements(self) -> PVector:
+    store = self.store
+    if store.vector is None: store.vector = box(store.numbers)
+    return store.vector
+
+  @elements.setter
+  def elements(self, elements:PVector):
+    self.store.vector = elements
+    self.store.numbers = None
+
+  def length(self) -> int:
+    if self.store.vector is None: return len(self.store.numbers)
+    return len(self.elements)
+
+  def numbers(self):
+    store = self.store
+    if store.numbers is None: store.numbers = unbox(self.elements)
+    return store.numbers
 
   def recent(self):
     try:
       return self.elements[-1], None
-    except:
+    except IndexError:
       return None, RTError(self.pos_start, self.pos_end, "Cant get recent value from empty list")
 
+  # Only lazy lists have anything to produce, and producing them can fail
+  def materialize(self):
+    return None
+
+  # Also produces the lazy lists nested in this one, each shared store is visited once
+  def materialize_all(self, seen:Union[set, None]=None):
+    error = self.materialize()
+    if error: return error
+
+    if seen is None: seen = set()
+    if id(self.store) in seen: return None
+    seen.add(id(self.store))
+    if self.store.vector is None: return None
+
+    for element in self.elements:
+      if isinstance(element, List):
+        error = element.materialize_all(seen)
+        if error: return error
+    return None
+
   def added_to(self, other):
-    new_list = self.copy()
+    error = self.materialize() or (other.materialize() if isinstance(other, List) else None)
+    if error: return None, error
+
+    error = list_length_error(self.length() + (other.length() if isinstance(other, List) else 1), self.pos_start, self.pos_end, self.context)
+    if error: return None, error
+
     if isinstance(other, List):
-      new_list.elements.extend(other.elements)
+      elements = self.elements.extend(other.elements)
     else:
-      new_list.elements.append(other)
+      elements = self.elements.append(other)
 
-    return new_list, None
+    return List(elements).set_context(self.context).set_position(self.pos_start, self.pos_end), None
 
   def multed_by(self, other):
     if isinstance(other, Number):
-      new_list = self.copy()
-      new_list.elements *= other.value
-      return new_list, None
+      error = self.materialize() or list_length_error(self.length() * other.value, self.pos_start, other.pos_end, self.context)
+      if error: return None, error
+
+      return List(list(self.elements) * other.value).set_context(self.context).set_position(self.pos_start, self.pos_end), None
     else:
       return None, self.illegal_operation(other)
 
   def subbed_by(self, other):
     if isinstance(other, Number):
-      new_list = self.copy()
+      error = self.materialize()
+      if error: return None, error
+
       try:
-        new_list.elements.pop(other.value)
-        return new_list, None
-      except:
+        elements = self.elements.remove(other.value)
+      except (IndexError, TypeError):
         return None, RTError(other.pos_start, other.pos_end, "Index to the list is out of bounds")
+      return List(elements).set_context(self.context).set_position(self.pos_start, self.pos_end), None
     else:
       return None, self.illegal_operation(other)
 
   def dived_by(self, other):
     if isinstance(other, Number):
       try:
+        if self.store.vector is None: return Number.make(item(self.store.numbers, other.value)), None
         return self.elements[other.value], None
-      except:
+      except (IndexError, TypeError):
         return None, RTError(other.pos_start, other.pos_end, "Index to the list is out of bounds")
     else:
       return None, self.illegal_operation(other)
 
   def copy(self):
-    return List(self.elements).set_context(self.context).set_position(self.pos_start, self.pos_end)
+    return List(self.store).set_context(self.context).set_position(self.pos_start, self.pos_end)
+
+  # Length of str(self) without building it, a store shared by several elements is measured once
+  def text_length(self, lengths:dict) -> int:
+    length = lengths.get(id(self.store))
+    if length is not None: return length
+    lengths[id(self.store)] = 0
+
+    length = 2 * max(0, self.length() - 1)
+    for element in self.elements:
+      length += element.text_length(lengths) if isinstance(element, List) else len(str(element))
+    lengths[id(self.store)] = length
+    return length
 
   def __repr__(self):
-    return str(self.elements)
+    return repr(self.elements)
 
   def __str__(self):
-    return ", ".join([str(x) for x in self.elements])
\ No newline at end of file
+    return ", ".join([str(x) for x in self.elements])
@@ -0,0 +1,20 @@
+from typing import Union
+from .basic.context import Context
+from .basic.value import Value
+from .basic.tail_call import TailCall
+from .nodes import Node, VarAssignNode, IfNode, ForNode, WhileNode, FuncDefNode, ListNode
+
+# Values are shared instead of copied when read and literals are interned, so the position and context
+# they carry can be stale or missing. A failed operation is re-run on copies located at the nodes that
+# produced its operands.
+def needs_location(node:Node) -> bool:
+  while isinstance(node, VarAssignNode):
+    node = node.value_node
+  return not isinstance(node, (IfNode, ListNode, ForNode, WhileNode, FuncDefNode))
+
+def located_value(node:Node, value:Union[Value, None], context:Context) -> Union[Value, None]:
+  while isinstance(node, VarAssignNode):
+    node = node.value_node
+  if value is None or isinstance(node, IfNode): return value
+  if isinstance(value, TailCall): return value.locate(node, context)
+  return value.copy().set_position(node.pos_start, node.pos_end).set_context(context)
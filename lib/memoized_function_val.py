@@ -0,0 +1,88 @@
+from collections import OrderedDict
+from typing import Union
+from .basic.base_function import BaseFunction
+from .basic.runtime_result import RTResult
+from .number_val import Number
+from .string_val import String
+from .list_val import List
+from .lazy_list_val import LazyList
+
+# Results of one memoized function, shared by every copy of its value (each call copies the callee)
+class MemoCache:
+  __slots__ = ("max_entries", "entries", "hits", "misses")
+
+  def __init__(self, max_entries:int):
+    self.max_entries = max_entries
+    self.entries = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+
+  def remember(self, key:tuple, value):
+    self.entries[key] = value
+    self.entries.move_to_end(key)
+    while len(self.entries) > self.max_entries:
+      self.entries.popitem(last=False)
+
+# Numbers and strings by value, lists by their content at the time of the call. Anything else
+# (functions) makes the call uncacheable.
+def memo_key(value) -> Union[tuple, None]:
+  if isinstance(value, (Number, String)):
+    return type(value), value.value
+  if isinstance(value, List):
+    if value.materialize(): return None
+    keys = memo_keys(value.elements)
+    return None if keys is None else (List, keys)
+  return None
+
+def memo_keys(values) -> Union[tuple, None]:
+  keys = []
+  for value in values:
+    key = memo_key(value)
+    if key is None: return None
+    keys.append(key)
+  return tuple(keys)
+
+# Wraps a function made by MEMOIZE. The function is assumed to be pure, with scoping being dynamic
+# its result could otherwise depend on variables of the caller that are not part of the key.
+class MemoizedFunction(BaseFunction):
+  __slots__ = ("function", "cache")
+
+  def __init__(self, function:BaseFunction, cache:MemoCache):
+    super(MemoizedFunction, self).__init__(function.name)
+    self.function = function
+    self.cache = cache
+
+  def execute(self, args:list, interpreter) -> RTResult:
+    key = memo_keys(args)
+    if key is not None and key in self.cache.entries: return RTResult().success(self.hit(key))
+
+    self.cache.misses += 1
+    res = self.callee().execute(args, interpreter)
+    if res.error: return res
+    return res.success(self.store(key, res.value))
+
+  def callee(self) -> BaseFunction:
+    return self.function.copy().set_position(self.pos_start, self.pos_end).set_context(self.context)
+
+  def hit(self, key:tuple):
+    self.cache.hits += 1
+    self.cache.entries.move_to_end(key)
+    return self.fresh(self.cache.entries[key])
+
+  def store(self, key:Union[tuple, None], value):
+    if key is not None: self.cache.remember(key, value)
+    return self.fresh(value)
+
+  # Lists are mutable, every caller gets its own list (sharing the persistent elements). Lazy lists
+  # share their source anyway and are not forced here.
+  def fresh(self, value):
+    if isinstance(value, LazyList): return value.copy()
+    if isinstance(value, List):
+      return List(value.elements).set_context(value.context).set_position(value.pos_start, value.pos_end)
+    return value
+
+  def copy(self):
+    return MemoizedFunction(self.function, self.cache).set_context(self.context).set_position(self.pos_start, self.pos_end)
+
+  def __repr__(self):
+    return f"<memoized function {self.name}>"
@@ -3,11 +3,15 @@ from .tokenClass import Token
 from .basic.position import Position
 
 class Node:
+  __slots__ = ("pos_start", "pos_end")
+
   def __init__(self):
     self.pos_start:Union[Position, None] = None
     self.pos_end:Union[Position, None] = None
 
 class NumberNode(Node):
+  __slots__ = ("tok",)
+
   def __init__(self, tok:Token):
     super(NumberNode, self).__init__()
     self.tok = tok
@@ -16,6 +20,8 @@ class NumberNode(Node):
     self.pos_end = self.tok.pos_end
 
 class StringNode(Node):
+  __slots__ = ("tok",)
+
   def __init__(self, tok:Token):
     super(StringNode, self).__init__()
     self.tok = tok
@@ -24,23 +30,31 @@ class StringNode(Node):
     self.pos_end = self.tok.pos_end
 
 class VarAccessNode(Node):
+  __slots__ = ("var_name_tok", "slot")
+
   def __init__(self, var_name_tok:Token):
     super(VarAccessNode, self).__init__()
     self.var_name_tok = var_name_tok
+    self.slot:Union[int, None] = None
 
     self.pos_start = self.var_name_tok.pos_start
     self.pos_end = self.var_name_tok.pos_end
   
 class VarAssignNode(Node):
+  __slots__ = ("var_name_tok", "value_node", "slot")
+
   def __init__(self, var_name_tok:Token, value_node:Node):
     super(VarAssignNode, self).__init__()
     self.var_name_tok = var_name_tok
     self.value_node = value_node
+    self.slot:Union[int, None] = None
 
     self.pos_start = self.var_name_tok.pos_start
     self.pos_end = self.value_node.pos_end
   
 class BinOpNode(Node):
+  __slots__ = ("left_node", "op_tok", "right_node")
+
   def __init__(self, left_node:Node, op_tok:Token, right_node:Node):
     super(BinOpNode, self).__init__()
     self.left_node = left_node
@@ -51,6 +65,8 @@ class BinOpNode(Node):
     self.pos_end = self.right_node.pos_end
 
 class UnaryOpNode(Node):
+  __slots__ = ("op_tok", "node")
+
   def __init__(self, op_tok:Token, node:Node):
     super(UnaryOpNode, self).__init__()
     self.op_tok = op_tok
@@ -60,6 +76,8 @@ class UnaryOpNode(Node):
     self.pos_end = node.pos_end
   
 class IfNode(Node):
+  __slots__ = ("cases", "else_case")
+
   def __init__(self, cases:list, else_case:Node):
     super(IfNode, self).__init__()
     self.cases = cases
@@ -69,6 +87,8 @@ class IfNode(Node):
     self.pos_end = self.cases[-1][0].pos_end if not self.else_case else else_case.pos_end
   
 class ForNode(Node):
+  __slots__ = ("var_name_token", "start_value_node", "end_value_node", "body_node", "step_value_node", "slot", "collect", "lazy")
+
   def __init__(self, var_name_token:Token, start_value_node:Node, end_value_node:Node, body_node:Node, step_value_node:Union[Node, None]=None):
     super(ForNode, self).__init__()
     self.var_name_token = var_name_token
@@ -76,25 +96,36 @@ class ForNode(Node):
     self.end_value_node = end_value_node
     self.body_node = body_node
     self.step_value_node = step_value_node
+    self.slot:Union[int, None] = None
+    self.collect = True
+    self.lazy = False
 
     self.pos_start = self.var_name_token.pos_start
     self.pos_end = self.body_node.pos_end
 
 class WhileNode(Node):
+  __slots__ = ("condition_node", "body_node", "collect", "lazy")
+
   def __init__(self, condition_node:Node, body_node:Node):
     super(WhileNode, self).__init__()
     self.condition_node = condition_node
     self.body_node = body_node
+    self.collect = True
+    self.lazy = False
 
     self.pos_start = self.condition_node.pos_start
     self.pos_end = self.body_node.pos_end
 
 class FuncDefNode(Node):
+  __slots__ = ("var_name_tok", "arg_name_toks", "body_node", "slot", "layout")
+
   def __init__(self, var_name_tok:Union[Token, None], arg_name_toks:list, body_node:Node):
     super(FuncDefNode, self).__init__()
     self.var_name_tok = var_name_tok
     self.arg_name_toks = arg_name_toks
     self.body_node = body_node
+    self.slot:Union[int, None] = None
+    self.layout:Union[dict, None] = None
 
     if self.var_name_tok:
       self.pos_start = self.var_name_tok.pos_start
@@ -106,10 +137,13 @@ class FuncDefNode(Node):
     self.pos_end = self.body_node.pos_end
 
 class CallNode(Node):
+  __slots__ = ("node_to_call", "arg_nodes", "tail")
+
   def __init__(self, node_to_call:Node, arg_nodes:list):
     super(CallNode, self).__init__()
     self.node_to_call = node_to_call
     self.arg_nodes = arg_nodes
+    self.tail = False
 
     self.pos_start = node_to_call.pos_start
     if len(self.arg_nodes) > 0:
@@ -118,9 +152,34 @@ class CallNode(Node):
       self.pos_end = self.node_to_call.pos_end
 
 class ListNode(Node):
+  __slots__ = ("element_nodes",)
+
   def __init__(self, element_nodes:list, pos_start:Union[Position, None]=None, pos_end:Union[Position, None]=None):
     super(ListNode, self).__init__()
     self.element_nodes = element_nodes
 
     self.pos_start = pos_start
     self.pos_end = pos_end
+
+class ConstantNode(Node):
+  __slots__ = ("value", "sizes")
+
+  def __init__(self, value, pos_start:Union[Position, None]=None, pos_end:Union[Position, None]=None):
+    super(ConstantNode, self).__init__()
+    self.value = value
+    # Longest list and string in the value, worked out by the first budgeted run using it
+    self.sizes:Union[tuple, None] = None
+
+    self.pos_start = pos_start
+    self.pos_end = pos_end
+
+class VoidNode(Node):
+  __slots__ = ("void_tok", "node")
+
+  def __init__(self, void_tok:Token, node:Node):
+    super(VoidNode, self).__init__()
+    self.void_tok = void_tok
+    self.node = node
+
+    self.pos_start = self.void_tok.pos_start
+    self.pos_end = self.node.pos_end
@@ -1,9 +1,16 @@
 from typing import Union
-from math import pi
+from math import pi, ceil, floor, isfinite
 from .basic.error import RTError
 from .basic.value import Value
+from .basic.budget import number_bits_error
+
+# Numbers are immutable, so these are shared instead of allocated for every result
+SMALL_INT_MIN = -128
+SMALL_INT_MAX = 1024
 
 class Number(Value):
+  __slots__ = ("value",)
+
   def __init__(self, value:Union[int, float]):
     super(Number, self).__init__()
     self.value = value
@@ -14,85 +21,91 @@ class Number(Value):
 
   def added_to(self, other):
     if isinstance(other, Number):
-      return Number(self.value + other.value).set_context(self.context), None
+      return Number.make(self.value + other.value), None
     else:
       return None, self.illegal_operation(other)
 
   def subbed_by(self, other):
     if isinstance(other, Number):
-      return Number(self.value - other.value).set_context(self.context), None
+      return Number.make(self.value - other.value), None
     else:
       return None, self.illegal_operation(other)
 
   def multed_by(self, other):
     if isinstance(other, Number):
-      return Number(self.value * other.value).set_context(self.context), None
+      if type(self.value) is int and type(other.value) is int:
+        error = number_bits_error(self.value.bit_length() + other.value.bit_length(), self.pos_start, other.pos_end, self.context)
+        if error: return None, error
+      return Number.make(self.value * other.value), None
     else:
       return None, self.illegal_operation(other)
 
   def dived_by(self, other):
     if isinstance(other, Number):
       if other.value == 0: return None, RTError(other.pos_start, other.pos_end, "Division by zero", self.context)
-      return Number(self.value / other.value).set_context(self.context), None
+      return Number.make(self.value / other.value), None
     else:
       return None, self.illegal_operation(other)
 
   def powed_by(self, other):
     if isinstance(other, Number):
-      return Number(self.value ** other.value).set_context(self.context), None
+      if type(self.value) is int and type(other.value) is int and other.value > 1:
+        error = number_bits_error(self.value.bit_length() * other.value, self.pos_start, other.pos_end, self.context)
+        if error: return None, error
+      return Number.make(self.value ** other.value), None
     else:
       return None, self.illegal_operation(other)
 
   def get_comparison_eq(self, other):
     if isinstance(other, Number):
-      return Number(int(self.value == other.value)).set_context(self.context), None
+      return Number.make(int(self.value == other.value)), None
     else:
       return None, self.illegal_operation(other)
 
   def get_comparison_ne(self, other):
     if isinstance(other, Number):
-      return Number(int(self.value != other.value)).set_context(self.context), None
+      return Number.make(int(self.value != other.value)), None
     else:
       return None, self.illegal_operation(other)
 
   def get_comparison_lt(self, other):
     if isinstance(other, Number):
-      return Number(int(self.value < other.value)).set_context(self.context), None
+      return Number.make(int(self.value < other.value)), None
     else:
       return None, self.illegal_operation(other)
 
   def get_comparison_gt(self, other):
     if isinstance(other, Number):
-      return Number(int(self.value > other.value)).set_context(self.context), None
+      return Number.make(int(self.value > other.value)), None
     else:
       return None, self.illegal_operation(other)
 
   def get_comparison_lte(self, other):
     if isinstance(other, Number):
-      return Number(int(self.value <= other.value)).set_context(self.context), None
+      return Number.make(int(self.value <= other.value)), None
     else:
       return None, self.illegal_operation(other)
 
   def get_comparison_gte(self, other):
     if isinstance(other, Number):
-      return Number(int(self.value >= other.value)).set_context(self.context), None
+      return Number.make(int(self.value >= other.value)), None
     else:
       return None, self.illegal_operation(other)
 
   def anded_by(self, other):
     if isinstance(other, Number):
-      return Number(int(self.value and other.value)).set_context(self.context), None
+      return Number.make(int(self.value and other.value)), None
     else:
       return None, self.illegal_operation(other)
 
   def ored_by(self, other):
     if isinstance(other, Number):
-      return Number(int(self.value or other.value)).set_context(self.context), None
+      return Number.make(int(self.value or other.value)), None
     else:
       return None, self.illegal_operation(other)
 
   def notted(self):
-    return Number(1 if self.value == 0 else 0).set_context(self.context), None
+    return Number.make(1 if self.value == 0 else 0), None
 
   def is_true(self):
     return self.value != 0
@@ -106,18 +119,48 @@ class Number(Value):
   def __repr__(self):
     return str(self.value)
 
+  @classmethod
+  def make(cls, value:Union[int, float]):
+    if type(value) is float and value.is_integer():
+      value = int(value)
+    if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+      return SMALL_INTS[value - SMALL_INT_MIN]
+    return Number(value)
+
   @classmethod
   def null(cls):
-    return Number(0)
+    return SMALL_INTS[-SMALL_INT_MIN]
 
   @classmethod
   def true(cls):
-    return Number(1)
+    return SMALL_INTS[1 - SMALL_INT_MIN]
 
   @classmethod
   def false(cls):
-    return Number(0)
+    return SMALL_INTS[-SMALL_INT_MIN]
 
   @classmethod
   def pi(cls):
     return Number(pi)
+
+SMALL_INTS = [Number(value) for value in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+
+# Values taken by the variable of FOR start TO end STEP step. Integer start and step become a plain range
+# (an integer i < 2.5 is i < 3, i > -2.5 is i > -3), everything else steps one comparison at a time.
+def loop_range(start, end, step):
+  if type(start) is int and type(step) is int and step != 0:
+    if type(end) is int:
+      return range(start, end, step)
+    if type(end) is float and isfinite(end):
+      return range(start, ceil(end) if step > 0 else floor(end), step)
+  return stepped_range(start, end, step)
+
+def stepped_range(i, end, step):
+  if step >= 0:
+    while i < end:
+      yield i
+      i += step
+  else:
+    while i > end:
+      yield i
+      i += step
@@ -0,0 +1,160 @@
+from typing import Union
+from .basic.context import Context
+from .basic.value import Value
+from .nodes import Node, BinOpNode, NumberNode, UnaryOpNode, VarAssignNode, IfNode, ForNode, WhileNode, FuncDefNode, CallNode, StringNode, ListNode, ConstantNode, VoidNode
+from .compiler import binary_operation_name
+from .number_val import Number
+from .string_val import String
+from .list_val import List
+from . import tokenClass
+
+# Folding is skipped when the result could get this big, the work is then left to runtime
+MAX_FOLDED_SIZE = 10000
+MAX_FOLDED_EXPONENT = 64
+# Folded powers are also capped by the size of their result, repeated folds would grow it without bound
+MAX_FOLDED_BITS = 4096
+
+def materialize_constant(value:Union[Value, None], context:Context) -> Union[Value, None]:
+  if value is None: return None
+
+  # Lists are mutable so every evaluation gets a fresh one, scalars are immutable and shared. The
+  # persistent vector of a list can be shared too unless it holds lists itself.
+  if isinstance(value, List):
+    elements = value.elements
+    if any(isinstance(element, List) for element in elements):
+      elements = [materialize_constant(element, context) for element in elements]
+    return List(elements).set_context(context).set_position(value.pos_start, value.pos_end)
+  return value
+
+class Optimizer:
+  def optimize(self, node:Node) -> Node:
+    method_name = f"optimize_{type(node).__name__}"
+    method = getattr(self, method_name, self.no_optimize_method)
+    return method(node)
+
+  def no_optimize_method(self, node:Node) -> Node:
+    return node
+
+  def constant_value(self, node:Node) -> Union[Value, None]:
+    if isinstance(node, NumberNode):
+      return Number.make(node.tok.value)
+    elif isinstance(node, StringNode):
+      return String(node.tok.value)
+    elif isinstance(node, ConstantNode):
+      return node.value
+    return None
+
+  def is_constant(self, node:Node) -> bool:
+    return isinstance(node, (NumberNode, StringNode)) or (isinstance(node, ConstantNode) and node.value is not None)
+
+  def safe_to_fold(self, operation_name:str, left:Value, right:Value) -> bool:
+    if operation_name == "powed_by" and isinstance(left, Number) and isinstance(right, Number):
+      if abs(left.value) <= 1: return True
+      if abs(right.value) > MAX_FOLDED_EXPONENT: return False
+      return type(left.value) is not int or left.value.bit_length() * abs(right.value) <= MAX_FOLDED_BITS
+    if operation_name == "multed_by" and isinstance(right, Number):
+      if isinstance(left, String): return left.length * abs(right.value) <= MAX_FOLDED_SIZE
+      if isinstance(left, List): return len(left.elements) * abs(right.value) <= MAX_FOLDED_SIZE
+    return True
+
+  def optimize_BinOpNode(self, node:BinOpNode) -> Node:
+    node.left_node = self.optimize(node.left_node)
+    node.right_node = self.optimize(node.right_node)
+    if not self.is_constant(node.left_node) or not self.is_constant(node.right_node): return node
+
+    operation_name = binary_operation_name(node.op_tok)
+    left = self.constant_value(node.left_node)
+    right = self.constant_value(node.right_node)
+    if operation_name is None or not self.safe_to_fold(operation_name, left, right): return node
+
+    # Operations that fail are kept so the error is raised at runtime at its original position
+    try:
+      result, error = getattr(left, operation_name)(right)
+    except Exception:
+      return node
+    if error or result is None: return node
+
+    if isinstance(result, List):
+      result = materialize_constant(result, None).set_position(node.pos_start, node.pos_end)
+    return ConstantNode(result, node.pos_start, node.pos_end)
+
+  def optimize_UnaryOpNode(self, node:UnaryOpNode) -> Node:
+    node.node = self.optimize(node.node)
+    if not self.is_constant(node.node): return node
+
+    operand = self.constant_value(node.node)
+    try:
+      if node.op_tok.type == tokenClass.TT_MINUS:
+        result, error = operand.multed_by(Number.make(-1))
+      elif node.op_tok.matches(tokenClass.TT_KEYWORD, "NOT"):
+        result, error = operand.notted()
+      else:
+        result, error = operand, None
+    except Exception:
+      return node
+    if error or result is None: return node
+
+    if isinstance(result, List):
+      result = materialize_constant(result, None).set_position(node.pos_start, node.pos_end)
+    return ConstantNode(result, node.pos_start, node.pos_end)
+
+  def optimize_IfNode(self, node:IfNode) -> Node:
+    cases = []
+    else_case = self.optimize(node.else_case) if node.else_case else None
+
+    for condition, expr in node.cases:
+      condition = self.optimize(condition)
+      expr = self.optimize(expr)
+
+      if self.is_constant(condition):
+        if self.constant_value(condition).is_true():
+          else_case = expr
+          break
+        continue
+
+      cases.append((condition, expr))
+
+    if len(cases) > 0:
+      node.cases = cases
+      node.else_case = else_case
+      return node
+
+    if else_case is not None: return else_case
+    return ConstantNode(None, node.pos_start, node.pos_end)
+
+  def optimize_ListNode(self, node:ListNode) -> Node:
+    node.element_nodes = [self.optimize(element_node) for element_node in node.element_nodes]
+    if not all(self.is_constant(element_node) for element_node in node.element_nodes): return node
+
+    elements = [materialize_constant(self.constant_value(element_node), None) for element_node in node.element_nodes]
+    return ConstantNode(List(elements).set_position(node.pos_start, node.pos_end), node.pos_start, node.pos_end)
+
+  def optimize_VarAssignNode(self, node:VarAssignNode) -> Node:
+    node.value_node = self.optimize(node.value_node)
+    return node
+
+  def optimize_ForNode(self, node:ForNode) -> Node:
+    node.start_value_node = self.optimize(node.start_value_node)
+    node.end_value_node = self.optimize(node.end_value_node)
+    if node.step_value_node:
+      node.step_value_node = self.optimize(node.step_value_node)
+    node.body_node = self.optimize(node.body_node)
+    return node
+
+  def optimize_WhileNode(self, node:WhileNode) -> Node:
+    node.condition_node = self.optimize(node.condition_node)
+    node.body_node = self.optimize(node.body_node)
+    return node
+
+  def optimize_VoidNode(self, node:VoidNode) -> Node:
+    node.node = self.optimize(node.node)
+    return node
+
+  def optimize_FuncDefNode(self, node:FuncDefNode) -> Node:
+    node.body_node = self.optimize(node.body_node)
+    return node
+
+  def optimize_CallNode(self, node:CallNode) -> Node:
+    node.node_to_call = self.optimize(node.node_to_call)
+    node.arg_nodes = [self.optimize(arg_node) for arg_node in node.arg_nodes]
+    return node
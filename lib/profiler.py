@@ -0,0 +1,135 @@
+from time import perf_counter
+from typing import Union, TextIO
+from .basic.context import Context
+from .nodes import Node
+from .interpreter import Interpreter
+
+class ProfileStat:
+  __slots__ = ("count", "inclusive", "exclusive", "active")
+
+  def __init__(self):
+    self.count = 0
+    self.inclusive = 0.0
+    self.exclusive = 0.0
+    # Nested activations of the same key (recursion, a BinOpNode inside a BinOpNode) only add their
+    # inclusive time once, at the outermost one
+    self.active = 0
+
+  def enter(self):
+    self.count += 1
+    self.active += 1
+
+  def leave(self, elapsed:float, exclusive:float):
+    self.active -= 1
+    if self.active == 0: self.inclusive += elapsed
+    self.exclusive += exclusive
+
+class ProfileFrame:
+  __slots__ = ("context", "stack", "stat", "child_time")
+
+  def __init__(self, context:Context, stack:tuple, stat:ProfileStat):
+    self.context = context
+    self.stack = stack
+    self.stat = stat
+    self.child_time = 0.0
+
+# Times collected by a ProfilingInterpreter. A function frame starts whenever a node is visited in a
+# different context than the one of the current frame, it is named after the context.
+class Profiler:
+  SORT_KEYS = ("exclusive", "inclusive", "count")
+
+  def __init__(self):
+    self.functions = {}
+    self.node_types = {}
+    self.lines = {}
+    self.line_texts = {}
+    self.stacks = {}
+    self.node_stats = {}
+    self.frames = []
+    self.child_times = [0.0]
+
+  def stats_for(self, node:Node) -> tuple:
+    stats = self.node_stats.get(node)
+    if stats is None:
+      type_name = type(node).__name__
+      # Keyed by the source rather than its name, every shell input is a "<stdin>"
+      if node.pos_start is None:
+        line = (None, 0)
+      else:
+        line = (node.pos_start.source, node.pos_start.ln + 1)
+        if line not in self.line_texts:
+          text = node.pos_start.ftxt.split("\n")[line[1] - 1].strip()
+          self.line_texts[line] = f"{node.pos_start.fn}:{line[1]} {text}"
+
+      if type_name not in self.node_types: self.node_types[type_name] = ProfileStat()
+      if line not in self.lines: self.lines[line] = ProfileStat()
+      stats = (self.node_types[type_name], self.lines[line])
+      self.node_stats[node] = stats
+    return stats
+
+  def enter_function(self, context:Context):
+    name = context.display_name
+    stat = self.functions.get(name)
+    if stat is None:
+      stat = ProfileStat()
+      self.functions[name] = stat
+    stat.enter()
+
+    stack = (self.frames[-1].stack if self.frames else ()) + (name,)
+    self.frames.append(ProfileFrame(context, stack, stat))
+
+  def leave_function(self, elapsed:float):
+    frame = self.frames.pop()
+    exclusive = elapsed - frame.child_time
+    frame.stat.leave(elapsed, exclusive)
+    self.stacks[frame.stack] = self.stacks.get(frame.stack, 0.0) + exclusive
+    if self.frames: self.frames[-1].child_time += elapsed
+
+  # One line per distinct stack of function names with its exclusive time in microseconds, the
+  # input format of flamegraph.pl, speedscope and similar tools
+  def write_collapsed(self, file:TextIO):
+    for stack, seconds in sorted(self.stacks.items()):
+      microseconds = int(round(seconds * 1e6))
+      if microseconds > 0: file.write(f"{';'.join(stack)} {microseconds}\n")
+
+  def table(self, title:str, rows:dict, sort:str, limit:Union[int, None]) -> list:
+    ordered = sorted(rows.items(), key=lambda row: getattr(row[1], sort), reverse=True)
+    lines = [f"{title:<48}{'count':>10}{'inclusive s':>14}{'exclusive s':>14}"]
+    for name, stat in ordered[:limit]:
+      lines.append(f"{name[:47]:<48}{stat.count:>10}{stat.inclusive:>14.6f}{stat.exclusive:>14.6f}")
+    return lines
+
+  def report(self, sort:str="exclusive", limit:Union[int, None]=20) -> str:
+    lines_by_name = {self.line_texts.get(line, "<unknown>"): stat for line, stat in self.lines.items()}
+    return "\n".join(
+      self.table("function", self.functions, sort, limit) + [""] +
+      self.table("node type", self.node_types, sort, limit) + [""] +
+      self.table("line", lines_by_name, sort, limit)
+    )
+
+# Interpreter that times every visited node. It is only used when a profile is asked for, so plain
+# runs don't pay for any of it.
+class ProfilingInterpreter(Interpreter):
+  def __init__(self, profiler:Profiler):
+    self.profiler = profiler
+
+  def visit(self, node:Node, context:Context):
+    profiler = self.profiler
+    frames = profiler.frames
+    entered = not frames or frames[-1].context is not context
+    if entered: profiler.enter_function(context)
+
+    type_stat, line_stat = profiler.stats_for(node)
+    type_stat.enter()
+    line_stat.enter()
+    profiler.child_times.append(0.0)
+    start = perf_counter()
+    try:
+      return super(ProfilingInterpreter, self).visit(node, context)
+    finally:
+      elapsed = perf_counter() - start
+      exclusive = elapsed - profiler.child_times.pop()
+      profiler.child_times[-1] += elapsed
+      type_stat.leave(elapsed, exclusive)
+      line_stat.leave(elapsed, exclusive)
+      if entered: profiler.leave_function(elapsed)
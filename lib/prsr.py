@@ -1,6 +1,6 @@
 from typing import Union, Callable, Iterable
 from .basic.error import InvalidSyntaxError, ErrorBase
-from .nodes import Node, NumberNode, BinOpNode, UnaryOpNode, VarAssignNode, VarAccessNode, IfNode, ForNode, WhileNode, FuncDefNode, CallNode, StringNode, ListNode
+from .nodes import Node, NumberNode, BinOpNode, UnaryOpNode, VarAssignNode, VarAccessNode, IfNode, ForNode, WhileNode, FuncDefNode, CallNode, StringNode, ListNode, VoidNode
 from . import tokenClass
 
 class ParserResult:
@@ -267,6 +267,21 @@ class Parser:
       if res.error: return res
       return res.success(while_expr)
 
+    elif tok.matches(tokenClass.TT_KEYWORD, "LAZY"):
+      res.register_advancement()
+      self.advance()
+
+      if self.current_token.matches(tokenClass.TT_KEYWORD, "FOR"):
+        loop_expr = res.register(self.for_expr())
+      elif self.current_token.matches(tokenClass.TT_KEYWORD, "WHILE"):
+        loop_expr = res.register(self.while_expr())
+      else:
+        return res.failure(InvalidSyntaxError(self.current_token.pos_start, self.current_token.pos_end, "Expected 'FOR' or 'WHILE'"))
+      if res.error: return res
+
+      loop_expr.lazy = True
+      return res.success(loop_expr)
+
     elif tok.matches(tokenClass.TT_KEYWORD, "FUNC"):
       func_def = res.register(self.func_def())
       if res.error: return res
@@ -338,6 +353,16 @@ class Parser:
 
       return res.success(VarAssignNode(var_name, NumberNode(tokenClass.Token(tokenClass.TT_INT, 0, self.current_token.pos_start, self.current_token.pos_end))))
 
+    if self.current_token.matches(tokenClass.TT_KEYWORD, "VOID"):
+      void_tok = self.current_token
+      res.register_advancement()
+      self.advance()
+
+      expr = res.register(self.expr())
+      if res.error: return res
+
+      return res.success(VoidNode(void_tok, expr))
+
     node = res.register(self.bin_op(self.comp_expr, ((tokenClass.TT_KEYWORD, "AND"), (tokenClass.TT_KEYWORD, "OR"))))
 
     if res.error:
@@ -0,0 +1,90 @@
+import re
+from typing import Union
+from .basic.error import IllegalCharError, ExpectedCharacterError, ErrorBase
+from .basic.position import Position, Source
+from . import tokenClass
+
+OPERATORS = {
+  "+": tokenClass.TT_PLUS,
+  "-": tokenClass.TT_MINUS,
+  "*": tokenClass.TT_MUL,
+  "/": tokenClass.TT_DIV,
+  "^": tokenClass.TT_POW,
+  "(": tokenClass.TT_LPAREN,
+  ")": tokenClass.TT_RPAREN,
+  "[": tokenClass.TT_LSBRAC,
+  "]": tokenClass.TT_RSBRAC,
+  "=": tokenClass.TT_EQ,
+  "==": tokenClass.TT_EE,
+  "!=": tokenClass.TT_NE,
+  "<": tokenClass.TT_LT,
+  ">": tokenClass.TT_GT,
+  "<=": tokenClass.TT_LTE,
+  ">=": tokenClass.TT_GTE,
+  ",": tokenClass.TT_COMMA,
+  "->": tokenClass.TT_ARROW
+}
+
+def character_class(characters:str) -> str:
+  return "[" + re.escape(characters) + "]"
+
+# One alternative per token kind, tried in order at each offset. Anything else is a single illegal character.
+MASTER_PATTERN = re.compile("|".join([
+  r"(?P<whitespace>[ \t]+)",
+  rf"(?P<number>{character_class(tokenClass.DIGITS)}+(?:\.{character_class(tokenClass.DIGITS)}*)?)",
+  rf"(?P<identifier>{character_class(tokenClass.LATTERS_EXTENDED)}{character_class(tokenClass.LATTERS_EXTENDED_DIGITS)}*)",
+  r'(?P<string>"[^"]*"?)',
+  r"(?P<keyword>:)",
+  "(?P<operator>" + "|".join(re.escape(operator) for operator in sorted(OPERATORS, key=len, reverse=True)) + ")",
+  r"(?P<bang>!)",
+  r"(?P<illegal>.)"
+]), re.DOTALL)
+
+KEYWORDS = frozenset(tokenClass.KEYWORDS)
+
+# Produces the same tokens and errors as Lexer, scanning with a single compiled regex
+class RegexLexer:
+  def __init__(self, fn, text):
+    self.fn = fn
+    self.text = text
+    self.source = Source(fn, text)
+
+  def make_tokens(self) -> (list, Union[ErrorBase, None]):
+    tokens = []
+    source = self.source
+    from_offsets = tokenClass.Token.from_offsets
+    end = len(self.text)
+
+    for match in MASTER_PATTERN.finditer(self.text):
+      kind = match.lastgroup
+      start, end = match.span()
+      lexeme = match.group()
+
+      if kind == "whitespace":
+        continue
+      elif kind == "identifier":
+        tok_type = tokenClass.TT_KEYWORD if lexeme in KEYWORDS else tokenClass.TT_IDENTIFIER
+        tokens.append(from_offsets(tok_type, lexeme, source, start, end))
+      elif kind == "number":
+        if "." in lexeme:
+          tokens.append(from_offsets(tokenClass.TT_FLOAT, float(lexeme), source, start, end))
+        else:
+          tokens.append(from_offsets(tokenClass.TT_INT, int(lexeme), source, start, end))
+      elif kind == "operator":
+        tokens.append(from_offsets(OPERATORS[lexeme], None, source, start, end))
+      elif kind == "string":
+        # Unterminated strings run to the end of the text, their end is one past it
+        if len(lexeme) < 2 or lexeme[-1] != "\"":
+          end += 1
+          tokens.append(from_offsets(tokenClass.TT_STRING, lexeme[1:].replace("\\", ""), source, start, end))
+        else:
+          tokens.append(from_offsets(tokenClass.TT_STRING, lexeme[1:-1].replace("\\", ""), source, start, end))
+      elif kind == "keyword":
+        tokens.append(from_offsets(tokenClass.TT_KEYWORD, lexeme, source, start, end))
+      elif kind == "bang":
+        return [], ExpectedCharacterError(Position(start, source), Position(start + 2, source), "'=' (after '!')")
+      else:
+        return [], IllegalCharError(Position(start, source), Position(end, source), "'" + lexeme + "'")
+
+    tokens.append(from_offsets(tokenClass.TT_EOF, None, source, end, end + 1))
+    return tokens, None
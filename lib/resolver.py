@@ -0,0 +1,110 @@
+from typing import Union
+from .nodes import Node, BinOpNode, UnaryOpNode, VarAccessNode, VarAssignNode, IfNode, ForNode, WhileNode, FuncDefNode, CallNode, ListNode, VoidNode
+
+# Scoping is dynamic (a function runs in a child of the context it was accessed from),
+# so only names local to a function body can be addressed statically. Every other name
+# keeps going through the SymbolTable parent chain.
+def child_nodes(node:Node) -> list:
+  if isinstance(node, BinOpNode):
+    return [node.left_node, node.right_node]
+  elif isinstance(node, UnaryOpNode):
+    return [node.node]
+  elif isinstance(node, VarAssignNode):
+    return [node.value_node]
+  elif isinstance(node, IfNode):
+    children = []
+    for condition, expr in node.cases:
+      children.append(condition)
+      children.append(expr)
+    if node.else_case: children.append(node.else_case)
+    return children
+  elif isinstance(node, ForNode):
+    children = [node.start_value_node, node.end_value_node]
+    if node.step_value_node: children.append(node.step_value_node)
+    children.append(node.body_node)
+    return children
+  elif isinstance(node, WhileNode):
+    return [node.condition_node, node.body_node]
+  elif isinstance(node, FuncDefNode):
+    return [node.body_node]
+  elif isinstance(node, CallNode):
+    return [node.node_to_call] + node.arg_nodes
+  elif isinstance(node, ListNode):
+    return node.element_nodes
+  elif isinstance(node, VoidNode):
+    return [node.node]
+  return []
+
+class Resolver:
+  def __init__(self):
+    self.layout:Union[dict, None] = None
+
+  def resolve(self, node:Node):
+    if isinstance(node, VarAccessNode):
+      if self.layout is not None:
+        node.slot = self.layout.get(node.var_name_tok.value)
+      return
+
+    if isinstance(node, VarAssignNode):
+      if self.layout is not None:
+        node.slot = self.layout.get(node.var_name_tok.value)
+    elif isinstance(node, ForNode):
+      if self.layout is not None:
+        node.slot = self.layout.get(node.var_name_token.value)
+    elif isinstance(node, FuncDefNode):
+      self.resolve_function(node)
+      return
+    elif isinstance(node, VoidNode):
+      self.mark_discarded(node.node)
+
+    for child in child_nodes(node):
+      self.resolve(child)
+
+  def resolve_function(self, node:FuncDefNode):
+    if node.var_name_tok and self.layout is not None:
+      node.slot = self.layout.get(node.var_name_tok.value)
+
+    layout = {}
+    for arg_name_tok in node.arg_name_toks:
+      layout.setdefault(arg_name_tok.value, len(layout))
+    self.declare_locals(node.body_node, layout)
+    node.layout = layout
+    self.mark_tail_calls(node.body_node)
+
+    enclosing_layout = self.layout
+    self.layout = layout
+    self.resolve(node.body_node)
+    self.layout = enclosing_layout
+
+  def declare_locals(self, node:Node, layout:dict):
+    if isinstance(node, VarAssignNode):
+      layout.setdefault(node.var_name_tok.value, len(layout))
+    elif isinstance(node, ForNode):
+      layout.setdefault(node.var_name_token.value, len(layout))
+    elif isinstance(node, FuncDefNode):
+      if node.var_name_tok:
+        layout.setdefault(node.var_name_tok.value, len(layout))
+      return
+
+    for child in child_nodes(node):
+      self.declare_locals(child, layout)
+
+  # Calls whose value is directly the function's return value, they are run by the caller's
+  # Function.execute loop (or in place by the VM) instead of nesting
+  def mark_tail_calls(self, node:Node):
+    if isinstance(node, CallNode):
+      node.tail = True
+    elif isinstance(node, IfNode):
+      for _, expr in node.cases:
+        self.mark_tail_calls(expr)
+      if node.else_case: self.mark_tail_calls(node.else_case)
+
+  # Loops whose value is thrown away don't build a result list, neither do loops nested in their bodies
+  def mark_discarded(self, node:Node):
+    if isinstance(node, (ForNode, WhileNode)):
+      node.collect = False
+      self.mark_discarded(node.body_node)
+    elif isinstance(node, IfNode):
+      for _, expr in node.cases:
+        self.mark_discarded(expr)
+      if node.else_case: self.mark_discarded(node.else_case)
@@ -1,31 +1,85 @@
+from typing import Union
 from .basic.value import Value
+from .basic.budget import string_length_error
 from .number_val import Number
 
+# Concatenations at least this long are deferred instead of copying both strings
+DEFER_LENGTH = 128
+
 class String(Value):
+  __slots__ = ("flat", "pieces", "count", "length")
+
   def __init__(self, value:str):
     super(String, self).__init__()
-    self.value = value
+    self.flat:Union[str, None] = value
+    # Unjoined text is the first count pieces. A concatenation appends to the list when nothing past
+    # count was appended yet and copies it otherwise, so strings built one after another share a list.
+    self.pieces:Union[list, None] = None
+    self.count = 0
+    self.length = len(value)
+
+  @property
+  def value(self) -> str:
+    if self.flat is None:
+      self.flat = "".join(self.pieces if self.count == len(self.pieces) else self.pieces[:self.count])
+      self.pieces = None
+    return self.flat
+
+  def concatenated(self, other):
+    length = self.length + other.length
+    if length < DEFER_LENGTH: return String(self.value + other.value)
+
+    if self.pieces is None:
+      pieces = [self.flat]
+    elif self.count == len(self.pieces):
+      pieces = self.pieces
+    else:
+      pieces = self.pieces[:self.count]
+
+    if other.pieces is None:
+      pieces.append(other.flat)
+    else:
+      pieces.extend(other.pieces[:other.count])
+
+    return String.deferred(pieces, len(pieces), length)
 
   def added_to(self, other):
     if isinstance(other, String):
-      return String(self.value + other.value).set_context(self.context), None
+      error = string_length_error(self.length + other.length, self.pos_start, other.pos_end, self.context)
+      if error: return None, error
+      return self.concatenated(other).set_context(self.context), None
     else:
       return None, self.illegal_operation(other)
 
   def multed_by(self, other):
     if isinstance(other, Number):
+      error = string_length_error(self.length * other.value, self.pos_start, other.pos_end, self.context)
+      if error: return None, error
       return String(self.value * other.value).set_context(self.context), None
     else:
       return None, self.illegal_operation(other)
 
   def is_true(self):
-    return len(self.value) > 0
+    return self.length > 0
 
   def copy(self):
-    return String(self.value).set_position(self.pos_start, self.pos_end).set_context(self.context)
+    if self.flat is None:
+      copy = String.deferred(self.pieces, self.count, self.length)
+    else:
+      copy = String(self.flat)
+    return copy.set_position(self.pos_start, self.pos_end).set_context(self.context)
 
   def __repr__(self):
     return f"\"{self.value}\""
 
   def __str__(self):
-    return self.value
\ No newline at end of file
+    return self.value
+
+  @classmethod
+  def deferred(cls, pieces:list, count:int, length:int):
+    string = String("")
+    string.flat = None
+    string.pieces = pieces
+    string.count = count
+    string.length = length
+    return string
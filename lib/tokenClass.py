@@ -1,6 +1,6 @@
 from typing import Union
 import string
-from .basic.position import Position
+from .basic.position import Position, Source
 
 TT_IDENTIFIER = "IDENTIFIER"
 TT_KEYWORD = "KEYWORD"
@@ -52,21 +52,47 @@ KEYWORDS = [
   "STEP",
   "WHILE",
   "DO",
-  "FUNC"
+  "FUNC",
+  "VOID",
+  "LAZY"
 ]
 
+# Tokens only keep offsets into their source, Position objects are made on access
 class Token:
+  __slots__ = ("type", "value", "source", "start", "end")
+
   def __init__(self, type_, value=None, pos_start:Union[None, Position]=None, pos_end:Union[None, Position]=None):
     self.type = type_
     self.value = value
+    self.source:Union[Source, None] = None
+    self.start:Union[int, None] = None
+    self.end:Union[int, None] = None
 
     if pos_start:
-      self.pos_start = pos_start.copy()
-      self.pos_end = self.pos_start.copy()
-      self.pos_end.advance()
+      self.source = pos_start.source
+      self.start = pos_start.idx
+      self.end = pos_start.idx + 1
 
     if pos_end:
-      self.pos_end = pos_end.copy()
+      self.end = pos_end.idx
+
+  @classmethod
+  def from_offsets(cls, type_, value, source:Source, start:int, end:int):
+    token = cls.__new__(cls)
+    token.type = type_
+    token.value = value
+    token.source = source
+    token.start = start
+    token.end = end
+    return token
+
+  @property
+  def pos_start(self) -> Union[Position, None]:
+    return Position(self.start, self.source) if self.source is not None else None
+
+  @property
+  def pos_end(self) -> Union[Position, None]:
+    return Position(self.end, self.source) if self.source is not None else None
 
   def matches(self, type_, value):
     return self.type == type_ and self.value == value
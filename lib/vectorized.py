@@ -0,0 +1,117 @@
+import operator
+from itertools import repeat
+from typing import Union
+from .basic.persistent_vector import PVector
+from .number_val import Number
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+OPERATORS = {
+  "+": operator.add,
+  "-": operator.sub,
+  "*": operator.mul,
+  "/": operator.truediv,
+  "^": operator.pow,
+  "==": operator.eq,
+  "!=": operator.ne,
+  "<": operator.lt,
+  ">": operator.gt,
+  "<=": operator.le,
+  ">=": operator.ge
+}
+
+COMPARISONS = frozenset(["==", "!=", "<", ">", "<=", ">="])
+
+# Integers up to this size are exact in a float64, so NumPy gives the same results as Python for them.
+# Powers are always left to Python, they can lose precision or turn complex.
+EXACT_LIMIT = 2 ** 53
+
+def is_exact(value) -> bool:
+  return type(value) is float or (type(value) is int and -EXACT_LIMIT <= value <= EXACT_LIMIT)
+
+def normalized(value):
+  if type(value) is float and value.is_integer(): return int(value)
+  return value
+
+# Unboxed numbers of a list, a float64 array when NumPy is installed and represents them exactly,
+# a list of plain ints and floats otherwise
+def pack(values:list):
+  if numpy is not None and all(is_exact(value) for value in values):
+    return numpy.array(values, dtype=numpy.float64)
+  return values
+
+def unbox(elements) -> Union[list, None]:
+  values = [element.value for element in elements if isinstance(element, Number)]
+  if len(values) != len(elements): return None
+  return pack(values)
+
+def box(numbers) -> PVector:
+  values = numbers.tolist() if numpy is not None and isinstance(numbers, numpy.ndarray) else numbers
+  return PVector.from_iterable([Number.make(value) for value in values])
+
+def item(numbers, index:int) -> Union[int, float]:
+  value = numbers[index]
+  return value.item() if numpy is not None and isinstance(numbers, numpy.ndarray) else value
+
+def plain(numbers) -> list:
+  if numpy is not None and isinstance(numbers, numpy.ndarray):
+    return [normalized(value) for value in numbers.tolist()]
+  return numbers
+
+def apply_numpy(symbol:str, left, right):
+  if symbol == "/":
+    has_zero = (right == 0).any() if isinstance(right, numpy.ndarray) else right == 0
+    if has_zero: return None
+
+  with numpy.errstate(all="ignore"):
+    result = OPERATORS[symbol](left, right)
+  if symbol in COMPARISONS: return result.astype(numpy.float64)
+  if symbol != "/" and len(result) and not numpy.abs(result).max() <= EXACT_LIMIT: return None
+  return result
+
+# Bits of the largest integer a multiplication or power over the elements can give, estimated the
+# way Number does before computing one
+def result_bits(symbol:str, left, right) -> int:
+  if symbol not in ("*", "^"): return 0
+  rights = repeat(right) if isinstance(right, (int, float)) else plain(right)
+  bits = 0
+  for value, other in zip(plain(left), rights):
+    if type(value) is not int or type(other) is not int: continue
+    if symbol == "*":
+      bits = max(bits, value.bit_length() + other.bit_length())
+    elif other > 1:
+      bits = max(bits, value.bit_length() * other)
+  return bits
+
+# Runs one operator over every element, right is a number or the numbers of an equally long list.
+# Returns the numbers of the result or an error message.
+def apply(symbol:str, left, right) -> tuple:
+  if not isinstance(right, (int, float)) and len(right) != len(left):
+    return None, "Lists must have the same length"
+
+  if numpy is not None and isinstance(left, numpy.ndarray) and symbol != "^":
+    if isinstance(right, numpy.ndarray) or is_exact(right):
+      result = apply_numpy(symbol, left, right)
+      if result is not None: return result, None
+
+  operation = OPERATORS[symbol]
+  left = plain(left)
+  try:
+    if isinstance(right, (int, float)):
+      if symbol == "/" and right == 0: raise ZeroDivisionError()
+      values = [operation(value, right) for value in left]
+    else:
+      right = plain(right)
+      if symbol == "/" and 0 in right: raise ZeroDivisionError()
+      values = [operation(value, other) for value, other in zip(left, right)]
+  except ZeroDivisionError:
+    return None, "Division by zero"
+  except OverflowError:
+    return None, "Result is too large"
+
+  if symbol in COMPARISONS:
+    return pack([int(value) for value in values]), None
+  return pack([normalized(value) for value in values]), None
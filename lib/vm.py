@@ -0,0 +1,256 @@
+from .basic.error import RTError
+from .basic.context import Context
+from .basic.runtime_result import RTResult
+from .basic.lru_cache import LRUCache
+from .nodes import Node
+from .compiler import Compiler, CodeObject, OP_LOAD_VAR, OP_STORE_VAR, OP_LOAD_NUMBER, OP_LOAD_STRING, OP_LOAD_NONE, OP_BINARY, OP_NEGATE, OP_NOT, OP_LOCATE, OP_JUMP, OP_JUMP_IF_FALSE, OP_FOR_SETUP, OP_FOR_ITER, OP_WHILE_SETUP, OP_LOOP_APPEND, OP_LOOP_END, OP_MAKE_FUNCTION, OP_PREPARE_CALL, OP_CALL, OP_BUILD_LIST, OP_RETURN, OP_LOAD_CONSTANT, OP_LOAD_SLOT, OP_STORE_SLOT, OP_TAIL_CALL, OP_POP, OP_LAZY_FOR, OP_LAZY_WHILE
+from .function_val import Function
+from .memoized_function_val import MemoizedFunction, memo_keys
+from .number_val import Number, loop_range
+from .list_val import List
+from .lazy_list_val import lazy_for, lazy_while
+from .optimizer import materialize_constant
+from .location import located_value
+
+# Programs and function bodies whose code is kept, the compile cache keeps far fewer programs
+CODE_CACHE_SIZE = 4096
+
+class VM:
+  # Only the Interpreter reports to hooks
+  hooks = None
+
+  def __init__(self):
+    self.compiler = Compiler()
+    self.code_cache = LRUCache(CODE_CACHE_SIZE)
+
+  def get_code(self, node:Node) -> CodeObject:
+    code = self.code_cache.get(node)
+    if code is None:
+      code = self.compiler.compile(node)
+      self.code_cache.put(node, code)
+    return code
+
+  def visit(self, node:Node, context:Context) -> RTResult:
+    return self.run(self.get_code(node), context)
+
+  def enter_function(self, function:Function, args:list) -> RTResult:
+    exec_ctx = function.generate_new_context()
+    res = function.check_and_populate_args(function.arg_names, args, exec_ctx)
+    if res.error: return res
+    return res.success(exec_ctx)
+
+  def run(self, code:CodeObject, context:Context) -> RTResult:
+    instructions = code.instructions
+    symbol_table = context.symbol_table
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    pc = 0
+    # Script function calls run in this loop, the callers' state is kept here instead of on the Python stack
+    frames = []
+    location = None
+    memo = None
+
+    while True:
+      op, arg, node = instructions[pc]
+      pc += 1
+
+      if op == OP_LOAD_SLOT:
+        value = symbol_table.slots[arg]
+        if value is None:
+          value = symbol_table.get(node.var_name_tok.value)
+          if not value:
+            return RTResult().failure(RTError(node.pos_start, node.pos_end, f"'{node.var_name_tok.value}' is not defined", context))
+        push(value)
+
+      elif op == OP_LOAD_VAR:
+        value = symbol_table.get(arg)
+        if not value:
+          return RTResult().failure(RTError(node.pos_start, node.pos_end, f"'{arg}' is not defined", context))
+        push(value)
+
+      elif op == OP_LOAD_NUMBER:
+        push(arg)
+
+      elif op == OP_BINARY:
+        right = pop()
+        left = pop()
+        result, error = getattr(left, arg)(right)
+        if error:
+          left = located_value(node.left_node, left, context)
+          right = located_value(node.right_node, right, context)
+          _, error = getattr(left, arg)(right)
+          return RTResult().failure(error)
+        push(result)
+
+      elif op == OP_JUMP_IF_FALSE:
+        if not pop().is_true():
+          pc = arg
+
+      elif op == OP_JUMP:
+        pc = arg
+
+      elif op == OP_FOR_ITER:
+        i = next(stack[-1][1], None)
+        if i is None:
+          pc = arg
+        elif node.slot is not None:
+          symbol_table.slots[node.slot] = Number.make(i)
+        else:
+          symbol_table.set(node.var_name_token.value, Number.make(i))
+
+      elif op == OP_LOOP_APPEND:
+        value = pop()
+        stack[-1][0].append(value)
+
+      elif op == OP_POP:
+        pop()
+
+      elif op == OP_STORE_SLOT:
+        symbol_table.slots[arg] = stack[-1]
+
+      elif op == OP_STORE_VAR:
+        if not symbol_table.set(arg, stack[-1]):
+          return RTResult().failure(RTError(node.var_name_tok.pos_start, node.var_name_tok.pos_end, "Invalid identifier - Protected variable", context))
+
+      elif op == OP_PREPARE_CALL:
+        push(pop().copy().set_position(node.pos_start, node.pos_end).set_context(context))
+
+      elif op == OP_CALL or op == OP_TAIL_CALL:
+        if arg:
+          args = stack[-arg:]
+          del stack[-arg:]
+        else:
+          args = []
+        value_to_call = pop()
+        callee_memo = None
+
+        if isinstance(value_to_call, MemoizedFunction) and isinstance(value_to_call.function, Function):
+          key = memo_keys(args)
+          if key is not None and key in value_to_call.cache.entries:
+            push(value_to_call.hit(key))
+            continue
+          value_to_call.cache.misses += 1
+          callee_memo = (value_to_call, key)
+          value_to_call = value_to_call.callee()
+
+        if not isinstance(value_to_call, Function):
+          res = value_to_call.execute(args, self)
+          if res.error: return res
+          push(res.value)
+          continue
+
+        res = self.enter_function(value_to_call, args)
+        if res.error: return res
+
+        # A memoized callee's result is stored when its frame returns, so it never replaces the caller's frame
+        if op == OP_TAIL_CALL and callee_memo is None:
+          # The frame is replaced, so the branch location it would have applied is kept for its return
+          if location is None and instructions[pc][0] == OP_LOCATE:
+            location = (instructions[pc][2], context)
+          context = res.value
+          symbol_table = context.symbol_table
+          instructions = self.get_code(value_to_call.body_node).instructions
+          stack.clear()
+          pc = 0
+        else:
+          frames.append((instructions, pc, stack, context, symbol_table, location, memo))
+          context = res.value
+          symbol_table = context.symbol_table
+          instructions = self.get_code(value_to_call.body_node).instructions
+          stack = []
+          push = stack.append
+          pop = stack.pop
+          pc = 0
+          location = None
+          memo = callee_memo
+
+      elif op == OP_LOAD_CONSTANT:
+        push(materialize_constant(arg, context))
+
+      elif op == OP_LOAD_STRING:
+        push(arg)
+
+      elif op == OP_LOAD_NONE:
+        push(None)
+
+      elif op == OP_NEGATE:
+        operand = pop()
+        result, error = operand.multed_by(Number.make(-1))
+        if error:
+          _, error = located_value(node.node, operand, context).multed_by(Number.make(-1))
+          return RTResult().failure(error)
+        push(result)
+
+      elif op == OP_NOT:
+        operand = pop()
+        result, error = operand.notted()
+        if error:
+          _, error = located_value(node.node, operand, context).notted()
+          return RTResult().failure(error)
+        push(result)
+
+      elif op == OP_LOCATE:
+        push(located_value(node, pop(), context))
+
+      elif op == OP_FOR_SETUP:
+        step_value = pop()
+        end_value = pop()
+        start_value = pop()
+        if step_value is None:
+          step_value = Number.make(1)
+        push([[], iter(loop_range(start_value.value, end_value.value, step_value.value))])
+
+      elif op == OP_WHILE_SETUP:
+        push([[]])
+
+      elif op == OP_LAZY_FOR:
+        step_value = pop()
+        end_value = pop()
+        start_value = pop()
+        if step_value is None:
+          step_value = Number.make(1)
+        push(lazy_for(self, node, context, loop_range(start_value.value, end_value.value, step_value.value)))
+
+      elif op == OP_LAZY_WHILE:
+        push(lazy_while(self, node, context))
+
+      elif op == OP_LOOP_END:
+        if node.collect:
+          push(List(pop()[0]).set_context(context).set_position(node.pos_start, node.pos_end))
+        else:
+          pop()
+          push(Number.null())
+
+      elif op == OP_MAKE_FUNCTION:
+        func_name = node.var_name_tok.value if node.var_name_tok else None
+        arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+        func_value = Function(func_name, node.body_node, arg_names, node.layout).set_context(context).set_position(node.pos_start, node.pos_end)
+
+        if node.slot is not None:
+          symbol_table.slots[node.slot] = func_value
+        elif node.var_name_tok:
+          symbol_table.set(func_name, func_value)
+        push(func_value)
+
+      elif op == OP_BUILD_LIST:
+        if arg:
+          elements = stack[-arg:]
+          del stack[-arg:]
+        else:
+          elements = []
+        push(List(elements).set_context(context).set_position(node.pos_start, node.pos_end))
+
+      elif op == OP_RETURN:
+        value = pop()
+        if location is not None: value = located_value(location[0], value, location[1])
+        if memo is not None: value = memo[0].store(memo[1], value)
+        if not frames: return RTResult().success(value)
+
+        instructions, pc, stack, context, symbol_table, location, memo = frames.pop()
+        push = stack.append
+        pop = stack.pop
+        push(value)
+
+      else:
+        raise Exception(f"Unknown opcode {op}")
@@ -1,37 +1,76 @@
+from typing import Union
 from lib.lexer import Lexer
+from lib.regex_lexer import RegexLexer
 from lib.prsr import Parser
+from lib.optimizer import Optimizer
+from lib.resolver import Resolver
+from lib.compile_cache import CompileCache
 from lib.interpreter import Interpreter
+from lib.vm import VM
+from lib.closure_compiler import ClosureCompiler
+from lib.profiler import Profiler, ProfilingInterpreter
+from lib.hooks import Hooks
+from lib.budgeted_interpreter import BudgetedInterpreter
+from lib.basic.budget import Budget, active_budget
 from lib.basic.context import Context
-from lib.basic.symbol_table import SymbolTable
+from lib.basic.symbol_table import SymbolTable, OverlaySymbolTable
 from lib.number_val import Number
 from lib.builtin_func_val import BuildInFunction
 
-global_symbol_table = SymbolTable()
-global_symbol_table.set("NULL", Number.null(), protected=True)
-global_symbol_table.set("TRUE", Number.true(), protected=True)
-global_symbol_table.set("FALSE", Number.false(), protected=True)
-global_symbol_table.set("PI", Number.pi(), protected=True)
-global_symbol_table.set("PRINT", BuildInFunction.print(), protected=True)
-global_symbol_table.set("PRINT_RET", BuildInFunction.print_ret(), protected=True)
-global_symbol_table.set("INPUT", BuildInFunction.input(), protected=True)
-global_symbol_table.set("INPUT_NUM", BuildInFunction.input_number(), protected=True)
-global_symbol_table.set("CLEAR", BuildInFunction.clear(), protected=True)
-global_symbol_table.set("CLS", BuildInFunction.clear(), protected=True)
-global_symbol_table.set("IS_NUM", BuildInFunction.is_number(), protected=True)
-global_symbol_table.set("IS_STR", BuildInFunction.is_string(), protected=True)
-global_symbol_table.set("IS_LIST", BuildInFunction.is_list(), protected=True)
-global_symbol_table.set("IS_FUNC", BuildInFunction.is_function(), protected=True)
-global_symbol_table.set("APPEND", BuildInFunction.append(), protected=True)
-global_symbol_table.set("POP", BuildInFunction.pop(), protected=True)
-global_symbol_table.set("EXTEND", BuildInFunction.extend(), protected=True)
-
-def run(fn, text):
-  if text == "" or text == "\n":
-    return None, None
+def builtin_symbol_table() -> SymbolTable:
+  table = SymbolTable()
+  table.set("NULL", Number.null(), protected=True)
+  table.set("TRUE", Number.true(), protected=True)
+  table.set("FALSE", Number.false(), protected=True)
+  table.set("PI", Number.pi(), protected=True)
+  table.set("PRINT", BuildInFunction.print(), protected=True)
+  table.set("PRINT_RET", BuildInFunction.print_ret(), protected=True)
+  table.set("INPUT", BuildInFunction.input(), protected=True)
+  table.set("INPUT_NUM", BuildInFunction.input_number(), protected=True)
+  table.set("CLEAR", BuildInFunction.clear(), protected=True)
+  table.set("CLS", BuildInFunction.clear(), protected=True)
+  table.set("IS_NUM", BuildInFunction.is_number(), protected=True)
+  table.set("IS_STR", BuildInFunction.is_string(), protected=True)
+  table.set("IS_LIST", BuildInFunction.is_list(), protected=True)
+  table.set("IS_FUNC", BuildInFunction.is_function(), protected=True)
+  table.set("APPEND", BuildInFunction.append(), protected=True)
+  table.set("POP", BuildInFunction.pop(), protected=True)
+  table.set("EXTEND", BuildInFunction.extend(), protected=True)
+  table.set("VECOP", BuildInFunction.vecop(), protected=True)
+  table.set("MAP", BuildInFunction.map(), protected=True)
+  table.set("FILTER", BuildInFunction.filter(), protected=True)
+  table.set("REDUCE", BuildInFunction.reduce(), protected=True)
+  table.set("SUM", BuildInFunction.sum(), protected=True)
+  table.set("LEN", BuildInFunction.len(), protected=True)
+  table.set("RANGE", BuildInFunction.range(), protected=True)
+  table.set("MEMOIZE", BuildInFunction.memoize(), protected=True)
+  table.set("MEMO_STATS", BuildInFunction.memo_stats(), protected=True)
+  return table
+
+# Global scope of main.run, shared by every call of it (the shell keeps variables between inputs)
+global_symbol_table = builtin_symbol_table()
+
+LEXERS = {
+  "regex": RegexLexer,
+  "scanner": Lexer
+}
+
+EXECUTION_MODES = {
+  "interpreter": Interpreter,
+  "vm": VM,
+  "closure": ClosureCompiler
+}
+
+compile_cache = CompileCache()
+
+def compile_program(fn, text, optimize=True, lexer="regex", cache=True):
+  if cache:
+    key = compile_cache.key(fn, text, (optimize,))
+    node = compile_cache.get(key)
+    if node is not None: return node, None
 
   # Get tokens
-  lexer = Lexer(fn, text)
-  tokens, error = lexer.make_tokens()
+  tokens, error = LEXERS[lexer](fn, text).make_tokens()
   if error: return None, error
 
   # Parse tokens
@@ -39,10 +78,79 @@ def run(fn, text):
   ast = parser.parse()
   if ast.error: return None, ast.error
 
-  # Interpret nodes
-  interpreter = Interpreter()
+  # Optimize nodes
+  node = Optimizer().optimize(ast.node) if optimize else ast.node
+
+  # Resolve function locals to frame slots
+  Resolver().resolve(node)
+
+  if cache: compile_cache.put(key, node)
+  return node, None
+
+def create_interpreter(mode="interpreter", profiler:Union[Profiler, None]=None, hooks:Union[Hooks, None]=None, budget:Union[Budget, None]=None):
+  if profiler is not None and budget is not None: raise ValueError("Profiling can't be combined with a budget")
+  if profiler is not None:
+    if mode != "interpreter": raise ValueError("Profiling is only supported in the interpreter mode")
+    interpreter = ProfilingInterpreter(profiler)
+  elif budget is not None:
+    if mode != "interpreter": raise ValueError("Budgets are only supported in the interpreter mode")
+    interpreter = BudgetedInterpreter(budget)
+  else:
+    interpreter = EXECUTION_MODES[mode]()
+  if hooks is not None:
+    if mode != "interpreter": raise ValueError("Hooks are only supported in the interpreter mode")
+    interpreter.hooks = hooks
+  return interpreter
+
+def execute(node, interpreter, symbol_table:SymbolTable, budget:Union[Budget, None]=None):
   context = Context("<program>")
-  context.symbol_table = global_symbol_table
-  result = interpreter.visit(ast.node, context)
+  context.symbol_table = symbol_table
+  if budget is None:
+    result = interpreter.visit(node, context)
+  else:
+    budget.start()
+    token = active_budget.set(budget)
+    try:
+      result = interpreter.visit(node, context)
+    finally:
+      active_budget.reset(token)
+
+  return result.value, result.error
+
+def run(fn, text, mode="interpreter", optimize=True, lexer="regex", cache=True, profiler:Union[Profiler, None]=None, hooks:Union[Hooks, None]=None, budget:Union[Budget, None]=None):
+  if text == "" or text == "\n":
+    return None, None
+
+  node, error = compile_program(fn, text, optimize, lexer, cache)
+  if error: return None, error
+
+  # Interpret nodes
+  return execute(node, create_interpreter(mode, profiler, hooks, budget), global_symbol_table, budget)
+
+# Runs scripts isolated from each other. The builtins are set up once per engine, every run gets its
+# own global scope layered over them unless it is given one to share.
+class Engine:
+  def __init__(self, mode="interpreter", optimize=True, lexer="regex", cache=True):
+    self.mode = mode
+    self.optimize = optimize
+    self.lexer = lexer
+    self.cache = cache
+    self.builtins = builtin_symbol_table()
+    # Reused by plain runs, so the VM and closure compiler keep what they compiled
+    self.interpreter = EXECUTION_MODES[mode]()
+
+  def new_scope(self) -> OverlaySymbolTable:
+    return OverlaySymbolTable(self.builtins)
+
+  def run(self, fn, text, scope:Union[OverlaySymbolTable, None]=None, profiler:Union[Profiler, None]=None, hooks:Union[Hooks, None]=None, budget:Union[Budget, None]=None):
+    if text == "" or text == "\n":
+      return None, None
+
+    node, error = compile_program(fn, text, self.optimize, self.lexer, self.cache)
+    if error: return None, error
 
-  return result.value, result.error
\ No newline at end of file
+    if profiler is None and hooks is None and budget is None:
+      interpreter = self.interpreter
+    else:
+      interpreter = create_interpreter(self.mode, profiler, hooks, budget)
+    return execute(node, interpreter, self.new_scope() if scope is None else scope, budget)
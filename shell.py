@@ -1,9 +1,32 @@
+import argparse
 import main
+from lib.profiler import Profiler
 
 if __name__ == '__main__':
+  arg_parser = argparse.ArgumentParser()
+  arg_parser.add_argument("--mode", choices=list(main.EXECUTION_MODES.keys()), default="interpreter")
+  arg_parser.add_argument("--lexer", choices=list(main.LEXERS.keys()), default="regex")
+  arg_parser.add_argument("--cache-dir", help="Directory for the on-disk compile cache")
+  arg_parser.add_argument("--profile", action="store_true", help="Print a profile of every input (interpreter mode only)")
+  arg_parser.add_argument("--profile-sort", choices=Profiler.SORT_KEYS, default="exclusive")
+  arg_parser.add_argument("--profile-limit", type=int, default=20, help="Rows per table of the profile")
+  arg_parser.add_argument("--collapsed", help="Append collapsed stacks of every input to this file (for flamegraph tools)")
+  args = arg_parser.parse_args()
+  profiling = args.profile or args.collapsed is not None
+  if profiling and args.mode != "interpreter":
+    arg_parser.error("profiling is only supported in the interpreter mode")
+  main.compile_cache.directory = args.cache_dir
+
   while True:
     text = input('>> ')
-    result, error = main.run('<stdin>', text)
+    profiler = Profiler() if profiling else None
+    result, error = main.run('<stdin>', text, mode=args.mode, lexer=args.lexer, profiler=profiler)
 
     if error: print(error.as_string())
     elif result: print(repr(result))
+
+    if profiler is not None:
+      if args.profile: print(profiler.report(args.profile_sort, args.profile_limit))
+      if args.collapsed is not None:
+        with open(args.collapsed, "a") as file:
+          profiler.write_collapsed(file)
@@ -0,0 +1,56 @@
+import sys
+import os
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.basic.persistent_vector import PVector
+
+class FrontRemovalTest(unittest.TestCase):
+  def test_removing_the_first_element_shares_the_trie(self):
+    vector = PVector.from_iterable(range(100000))
+    removed = vector.remove(0)
+
+    self.assertIs(removed.root, vector.root)
+    self.assertIs(removed.tail, vector.tail)
+    self.assertEqual(len(removed), 99999)
+    self.assertEqual(removed[0], 1)
+    self.assertEqual(removed[-1], 99999)
+
+  # Every removal either shares the trie or rebuilds once the removed front outnumbers the rest, so
+  # emptying a vector from the front rebuilds O(log n) times and copies fewer than n elements
+  def test_emptying_from_the_front_copies_linearly(self):
+    size = 100000
+    vector = PVector.from_iterable(range(size))
+    rebuilds = 0
+    copied = 0
+    for expected in range(size):
+      self.assertEqual(vector[0], expected)
+      removed = vector.remove(0)
+      if len(removed) and removed.root is not vector.root:
+        rebuilds += 1
+        copied += len(removed)
+      vector = removed
+
+    self.assertEqual(len(vector), 0)
+    self.assertLessEqual(rebuilds, size.bit_length())
+    self.assertLess(copied, size)
+
+  def test_updates_after_front_removal(self):
+    expected = list(range(70))
+    vector = PVector.from_iterable(expected)
+    for _ in range(5):
+      vector = vector.remove(0)
+      del expected[0]
+
+    vector = vector.append(70).extend(range(71, 140)).pop().remove(-3).remove(10)
+    expected = (expected + list(range(70, 140)))[:-1]
+    del expected[-3]
+    del expected[10]
+
+    self.assertEqual(list(vector), expected)
+    self.assertEqual([vector[index] for index in range(-len(expected), len(expected))], expected + expected)
+    with self.assertRaises(IndexError): vector[len(expected)]
+
+if __name__ == '__main__':
+  unittest.main()